@@ -0,0 +1,54 @@
+"""Add Example keyset pagination indexes
+
+Revision ID: 3c9e1a7b5d20
+Revises: f17a2dbcd7f1
+Create Date: 2026-10-16 10:15:42.118204
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3c9e1a7b5d20"
+down_revision = "f17a2dbcd7f1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built without blocking the writes to the table, which CONCURRENTLY only
+    # allows outside of a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix__example__example_status_id",
+            "example",
+            ["example_status", "id"],
+            unique=False,
+            schema="template_core",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix__example__example_date_id",
+            "example",
+            ["example_date", "id"],
+            unique=False,
+            schema="template_core",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix__example__example_date_id",
+            table_name="example",
+            schema="template_core",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix__example__example_status_id",
+            table_name="example",
+            schema="template_core",
+            postgresql_concurrently=True,
+        )
@@ -1,13 +1,114 @@
+import json
 import uuid
-from typing import Any, Generic, Type, TypeVar
-
-from sqlalchemy import delete, select, update
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from typing import Any, AsyncIterator, Generic, Sequence, Type, TypeVar
+
+import asyncpg  # type: ignore
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    Column,
+    Select,
+    Table,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+    SessionTransaction,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.util import await_only
+
+from .batch_loader import BatchLoader
+from .counted_list import CountedList
+from .entity_cache import ENTITY_CACHE_REQUESTS, EntityCache
+from .enums.sort import SortOrder
+from .enums.total_mode import TotalMode
+from .exceptions.exceptions import (
+    BadRequestError,
+)
 from .models.base_model import BaseOrmModel
+from .parameters.cursor import Cursor
 
 T = TypeVar("T", bound=BaseOrmModel)
 
+# asyncpg accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMETERS = 32767
+
+# Keys of `Session.info` describing the writes of the current transaction
+UNCOMMITTED_WRITES = "uncommitted_writes"
+CACHE_INVALIDATIONS = "entity_cache_invalidations"
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, returning the plan as one row."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    session.info[UNCOMMITTED_WRITES] = True
+
+
+def _mark_write(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[UNCOMMITTED_WRITES] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    # Commits of an AsyncSession run in a greenlet, which may await the cache
+    for cache, key in session.info.pop(CACHE_INVALIDATIONS, ()):
+        await_only(cache.delete(key))
+
+
+def _forget_writes(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(UNCOMMITTED_WRITES, None)
+        session.info.pop(CACHE_INVALIDATIONS, None)
+
+
+def track_writes(session: Session) -> None:
+    """
+    Tracks the writes of the transactions of `session` in `Session.info`:
+    `UNCOMMITTED_WRITES` is set while the transaction has written anything, and
+    the entity cache entries listed in `CACHE_INVALIDATIONS` are deleted once it
+    commits. Both are cleared when the transaction ends.
+    """
+    for identifier, listener in (
+        ("after_flush", _mark_flush),
+        ("do_orm_execute", _mark_write),
+        ("after_commit", _invalidate_after_commit),
+        ("after_transaction_end", _forget_writes),
+    ):
+        if not event.contains(session, identifier, listener):
+            event.listen(session, identifier, listener)
+
 
 class BaseRepository(Generic[T]):
     """
@@ -23,40 +124,81 @@ class BaseRepository(Generic[T]):
                      classes.
     - `async_session`: An instance of SQLAlchemy's AsyncSession class, used for interacting
                  with the database.
+    - `read_session`: The session used by read-only methods (`find_*`, `stream`). It may
+                 be bound to a read replica, so it can lag behind `async_session`.
+                 Defaults to `async_session`.
+    - `cache`: Optional `EntityCache` serving `find_one` lookups by id. `save`,
+                 `update`, `delete` and `upsert_many` keep it up to date: entries
+                 are deleted when written and again when the transaction commits,
+                 and nothing is cached from a transaction with uncommitted writes.
 
     This base class has the following methods:
 
     - `save`: Asynchronously saves a model instance to the database.
+    - `find_all`: Lists instances with offset or keyset (cursor) pagination.
+    - `count`: Counts the rows of a query, exactly or from the planner estimate.
+    - `next_cursor`: Builds the cursor pointing after the last item of a page.
+    - `stream`: Iterates over the results of a query in batches, using a server-side
+                cursor.
+    - `copy_insert`: Bulk loads rows with COPY, bypassing the ORM unit of work.
+    - `upsert_many`: Inserts or updates rows in batches with INSERT ... ON CONFLICT.
+    - `find_many`: Finds the instances of a list of ids with a single query.
+    - `load_one`: Like `find_one`, but coalesces concurrent calls into `find_many`.
     """
 
     __abstract__ = True
 
-    def __init__(self, async_session: AsyncSession):
+    def __init__(
+        self,
+        async_session: AsyncSession,
+        read_session: AsyncSession | None = None,
+        cache: EntityCache | None = None,
+    ):
         """
         Initializes the RepositoryBase instance.
 
         Args:
             async_session (AsyncSession):
             A SQLAlchemy session that will be used to query the database.
+            read_session (AsyncSession, optional):
+            A SQLAlchemy session, possibly on a read replica, used by read-only methods.
+            cache (EntityCache, optional):
+            The cache of the instances found by `find_one`.
         """
         self.async_session = async_session
+        self.read_session = read_session or async_session
+        self.cache = cache
+        self._loaders: dict[Type[T], BatchLoader[T]] = {}
+        if cache is not None:
+            track_writes(async_session.sync_session)
 
-    async def save(self, model: T) -> T:
+    async def save(self, model: T, refresh: bool = True) -> T:
         """
         Asynchronously saves a model instance to the database.
 
         This method adds the model to the SQLAlchemy session, commits the session to save the model
         to the database, and refreshes the model to ensure it has the latest data from the database
 
+        With `refresh=False` the extra SELECT is skipped: `BaseOrmModel` sets
+        `eager_defaults`, so server generated columns come back in the RETURNING clause
+        of the INSERT itself. Only the attributes still unloaded after the commit (e.g.
+        on a session that expires on commit) are refreshed.
+
         Args:
             model (Any): The model instance to be saved to the database.
+            refresh (bool, optional): Whether to reload the whole instance after the
+                commit. Defaults to True.
 
         Returns:
             Any: The saved model instance, refreshed from the database.
         """
         self.async_session.add(model)
         await self.async_session.commit()
-        await self.async_session.refresh(model)
+        if refresh:
+            await self.async_session.refresh(model)
+        elif unloaded := inspect(model).unloaded:
+            await self.async_session.refresh(model, attribute_names=unloaded)
+        await self._cache_put(model)
         return model
 
     async def find_all(
@@ -65,28 +207,156 @@ class BaseRepository(Generic[T]):
         skip: int = 0,
         limit: int = 100,
         options: list[Any] | None = None,
-    ) -> list[T]:
+        sort_key: str | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        cursor: str | None = None,
+        total: TotalMode | None = None,
+    ) -> CountedList[T]:
         """
         Asynchronously finds all instances of a model, with optional pagination.
 
+        When `sort_key` or `cursor` is given, rows are ordered by `(sort_key, id)`.
+        With a `cursor`, the page starts right after the row the cursor points to
+        and `skip` is ignored, so the cost of a page does not depend on its depth.
+
         Args:
             options:
             model (Type[Any]): The model class to query.
             skip (int, optional): Number of instances to skip for pagination. Defaults to 0.
             limit (int, optional): Maximum number of instances to return. Defaults to 100.
+            sort_key (str, optional): Name of the column to sort by. Defaults to `id`
+                when a cursor is given.
+            sort_order (SortOrder, optional): Direction of the sort. Defaults to ASC.
+            cursor (str, optional): Cursor returned by `next_cursor` for the previous
+                page.
+            total (TotalMode, optional): Metadata to compute along with the page.
+                Defaults to none.
 
         Returns:
-            list[Any]: A list of model instances.
+            CountedList[Any]: A list of model instances, with `total` or `has_more`
+            set according to `total`.
         """
 
         stmt = select(model)
         if options is None:
             options = []
         stmt = stmt.options(*options)
+        count_stmt = stmt
 
-        stmt = stmt.offset(skip).limit(limit)
-        result = await self.async_session.execute(stmt)
-        return list(result.scalars().all())
+        if sort_key or cursor:
+            stmt = self._keyset(stmt, model, sort_key or "id", sort_order, cursor)
+        if cursor is None:
+            stmt = stmt.offset(skip)
+
+        return await self.find_page(stmt, limit, total, count_stmt)
+
+    async def find_page(
+        self,
+        stmt: Select[Any],
+        limit: int,
+        total: TotalMode | None = None,
+        count_stmt: Select[Any] | None = None,
+    ) -> CountedList[T]:
+        """
+        Asynchronously fetches up to `limit` instances of `stmt` and the requested
+        metadata.
+
+        With `TotalMode.HAS_MORE` one extra row is fetched to tell whether a next
+        page exists, at no extra round trip. `EXACT` and `ESTIMATED` run `count` on
+        `count_stmt` after the page query.
+
+        Args:
+            stmt (Select[Any]): The query of the page, already sorted and offset.
+            limit (int): Maximum number of instances to return.
+            total (TotalMode, optional): Metadata to compute. Defaults to none.
+            count_stmt (Select[Any], optional): The query whose rows are counted,
+                i.e. `stmt` without the keyset condition. Defaults to `stmt`.
+
+        Returns:
+            CountedList[T]: The instances of the page and their metadata.
+        """
+        if total == TotalMode.HAS_MORE:
+            result = await self.read_session.execute(stmt.limit(limit + 1))
+            items = result.scalars().all()
+            return CountedList(items[:limit], has_more=len(items) > limit)
+
+        result = await self.read_session.execute(stmt.limit(limit))
+        items = result.scalars().all()
+        if total is None:
+            return CountedList(items)
+        if count_stmt is None:
+            count_stmt = stmt
+        return CountedList(items, total=await self.count(count_stmt, total))
+
+    async def count(self, stmt: Select[Any], mode: TotalMode = TotalMode.EXACT) -> int:
+        """
+        Asynchronously counts the rows returned by `stmt`, ignoring its ordering,
+        offset and limit.
+
+        `EXACT` runs `SELECT count(*)` over the query. `ESTIMATED` costs no scan:
+        an unfiltered query over one table reads `pg_class.reltuples`, as of the
+        last VACUUM or ANALYZE, and any other query (or a never analyzed table)
+        takes the row estimate of its `EXPLAIN` plan, which can be far off for
+        selective or correlated filters.
+
+        Args:
+            stmt (Select[Any]): The query to count.
+            mode (TotalMode, optional): `EXACT` or `ESTIMATED`. Defaults to `EXACT`.
+
+        Returns:
+            int: The number of rows.
+        """
+        stmt = stmt.order_by(None).limit(None).offset(None)
+        if mode == TotalMode.EXACT:
+            count = await self.read_session.scalar(
+                select(func.count()).select_from(stmt.subquery())
+            )
+            return int(count or 0)
+
+        froms = stmt.get_final_froms()
+        if (
+            stmt.whereclause is None
+            and len(froms) == 1
+            and hasattr(froms[0], "fullname")
+        ):
+            reltuples = await self.read_session.scalar(
+                text(
+                    "SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"
+                ),
+                {"name": froms[0].fullname},
+            )
+            # reltuples is -1 until the table is first vacuumed or analyzed
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+
+        plan = await self.read_session.scalar(Explain(stmt))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def stream(
+        self, stmt: Select[Any], batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[T]]:
+        """
+        Asynchronously iterates over the results of `stmt` in batches.
+
+        Rows are fetched through a server-side cursor, `batch_size` at a time, so
+        memory stays bounded by the batch size however many rows the query returns.
+        The session keeps a connection checked out until the iteration ends.
+
+        Args:
+            stmt (Select[Any]): The query to stream.
+            batch_size (int, optional): Number of rows fetched per round trip.
+                Defaults to 1000.
+
+        Yields:
+            Sequence[T]: The next batch of model instances.
+        """
+        result = await self.read_session.stream_scalars(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
 
     async def find_one(
         self, model: Type[T], _id: uuid.UUID, options: list[Any] | None = None
@@ -94,6 +364,12 @@ class BaseRepository(Generic[T]):
         """
         Asynchronously finds a single instance of a model by its id.
 
+        With a `cache`, lookups without `options` are served from it when possible.
+        A hit is merged into `read_session` without querying the database; a miss
+        is loaded from `async_session`, not from a possibly lagging replica, and
+        then cached, unless the entry was invalidated while it was loading or the
+        transaction of `async_session` has uncommitted writes.
+
         Args:
             options:
             model (Type[T]): The model class to query.
@@ -109,9 +385,80 @@ class BaseRepository(Generic[T]):
         stmt = stmt.options(*options)
         stmt = stmt.where(model.id == _id)
 
+        if self.cache is None or options:
+            result = await self.read_session.execute(stmt)
+            invoice = result.scalars().one()
+            return invoice
+
+        key = self._cache_key(model, _id)
+        values = await self.cache.get(key)
+        if values is not None:
+            ENTITY_CACHE_REQUESTS.labels(model=model.__name__, result="hit").inc()
+            return await self._from_cache(model, values)
+
+        ENTITY_CACHE_REQUESTS.labels(model=model.__name__, result="miss").inc()
+        token = await self.cache.token(key)
         result = await self.async_session.execute(stmt)
-        invoice = result.scalars().one()
-        return invoice
+        instance = result.scalars().one()
+        await self._cache_put(instance, token)
+        return instance
+
+    async def find_many(
+        self,
+        model: Type[T],
+        ids: Sequence[uuid.UUID],
+        options: list[Any] | None = None,
+    ) -> list[T]:
+        """
+        Asynchronously finds the instances of a model with the given ids.
+
+        The ids are sent as a single array parameter (`id = ANY(:ids)`), so the
+        statement is the same however many ids are looked up.
+
+        Args:
+            options:
+            model (Type[T]): The model class to query.
+            ids (Sequence[UUID]): The ids of the instances.
+
+        Returns:
+            list[T]: The found instances, in the order of `ids`. Missing ids are
+            skipped and repeated ids yield the same instance again.
+        """
+        if not ids:
+            return []
+
+        stmt = select(model)
+        if options is None:
+            options = []
+        stmt = stmt.options(*options)
+        stmt = stmt.where(
+            model.id
+            == any_(bindparam("ids", list(set(ids)), type_=ARRAY(model.id.type)))
+        )
+
+        result = await self.read_session.execute(stmt)
+        found = {instance.id: instance for instance in result.scalars().all()}
+        return [found[_id] for _id in ids if _id in found]
+
+    async def load_one(self, model: Type[T], _id: uuid.UUID) -> T:
+        """
+        Asynchronously finds a single instance of a model by its id, batching the
+        lookups made concurrently through the same repository.
+
+        Every `load_one` issued in the same event-loop tick (e.g. from
+        `asyncio.gather`) is resolved by one `find_many` query.
+
+        Args:
+            model (Type[T]): The model class to query.
+            _id (UUID): The id of the instance.
+
+        Returns:
+            T: The found instance.
+            Throws an exception if the instance does not exist.
+        """
+        if model not in self._loaders:
+            self._loaders[model] = BatchLoader(self, model)
+        return await self._loaders[model].load(_id)
 
     async def update(
         self,
@@ -130,6 +477,7 @@ class BaseRepository(Generic[T]):
         """
         stmt = update(model).where(model.id == _id).values(**values)
         await self.async_session.execute(stmt)
+        await self._cache_delete(model, [_id])
         if commit:
             await self.async_session.commit()
 
@@ -148,6 +496,17 @@ class BaseRepository(Generic[T]):
 
         async with self.async_session.begin():
             await self.async_session.execute(stmt)
+            await self._cache_delete(model, [_id])
+
+    async def rollback(self) -> None:
+        """
+        Rolls back the sessions of the repository, e.g. after a transient error,
+        so that the next statement runs in a new transaction. A connection that
+        was invalidated is released, and a new one is checked out of the pool.
+        """
+        await self.async_session.rollback()
+        if self.read_session is not self.async_session:
+            await self.read_session.rollback()
 
     async def add(self, model: T) -> T:
         """
@@ -175,3 +534,300 @@ class BaseRepository(Generic[T]):
         """
         self.async_session.add_all(models)
         await self.async_session.flush()
+
+    @staticmethod
+    def next_cursor(
+        items: Sequence[T], limit: int, sort_key: str, sort_order: SortOrder
+    ) -> str | None:
+        """
+        Builds the cursor of the page following `items`.
+
+        Args:
+            items (Sequence[T]): The instances of the current page.
+            limit (int): The page size used to fetch `items`.
+            sort_key (str): Name of the column the page is sorted by.
+            sort_order (SortOrder): Direction of the sort.
+
+        Returns:
+            str | None: The cursor of the next page, or None if `items` is the
+            last page.
+        """
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        return Cursor(
+            sort_key=sort_key,
+            sort_order=sort_order,
+            value=getattr(last, sort_key),
+            id=last.id,
+        ).encode()
+
+    @classmethod
+    def _keyset(
+        cls,
+        stmt: Select[Any],
+        model: Type[T],
+        sort_key: str,
+        sort_order: SortOrder,
+        cursor: str | None,
+    ) -> Select[Any]:
+        """
+        Orders `stmt` by `(sort_key, id)` and, if a cursor is given, filters out
+        every row up to and including the one the cursor points to.
+
+        Raises:
+            BadRequestError: If the cursor is invalid or was issued for another sort.
+        """
+        sort_column = getattr(model, sort_key)
+        columns = [sort_column] if sort_key == "id" else [sort_column, model.id]
+        is_asc = sort_order == SortOrder.ASC
+
+        if cursor is not None:
+            position = Cursor.decode(cursor)
+            if position.sort_key != sort_key or position.sort_order != sort_order:
+                raise BadRequestError(detail="Cursor does not match the requested sort")
+            try:
+                value = TypeAdapter(sort_column.type.python_type).validate_python(
+                    position.value
+                )
+            except ValidationError as exc:
+                raise BadRequestError(detail="Invalid cursor") from exc
+            bound = [value] if sort_key == "id" else [value, position.id]
+            key, last = tuple_(*columns), tuple(bound)
+            stmt = stmt.where(key > last if is_asc else key < last)
+
+        sort_func = asc if is_asc else desc
+        return stmt.order_by(*(sort_func(column) for column in columns))
+
+    async def copy_insert(
+        self, model: Type[T], rows: Sequence[dict[str, Any]], commit: bool = True
+    ) -> list[str | None]:
+        """
+        Asynchronously bulk loads rows into the table of `model`.
+
+        On asyncpg the rows are sent with `COPY ... FROM STDIN` in a single round
+        trip; other drivers fall back to a multi-row INSERT. No ORM instance is
+        built: columns missing from a row take the column's Python default, scalar
+        or callable, and the rows still missing columns with a server default are
+        loaded in a separate batch that leaves those columns out, so the server
+        fills them in.
+
+        Each batch is loaded in a savepoint. When the database rejects it, the
+        batch is split in halves that are loaded again, down to the rows at fault,
+        so that one bad row does not reject the others.
+
+        Args:
+            model (Type[T]): The model class whose table the rows are loaded into.
+            rows (Sequence[dict[str, Any]]): The rows to load, keyed by column name.
+            commit (bool, optional): Whether to commit after loading. Defaults to True.
+
+        Returns:
+            list[str | None]: For every row, in order, the error of the database if
+            the row was rejected, or None if it was loaded.
+        """
+        errors: list[str | None] = [None] * len(rows)
+        if not rows:
+            return errors
+
+        table = model.__table__
+        batches: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+        for index, row in enumerate(rows):
+            values = {}
+            for column in table.columns:
+                if column.name in row:
+                    values[column.name] = row[column.name]
+                elif column.default is not None and column.default.is_scalar:
+                    values[column.name] = column.default.arg
+                elif column.default is not None and column.default.is_callable:
+                    values[column.name] = column.default.arg(None)
+                elif column.server_default is None and column.default is None:
+                    values[column.name] = None
+            batches.setdefault(tuple(values), []).append((index, values))
+
+        for names, batch in batches.items():
+            columns = [table.columns[name] for name in names]
+            pending = [batch]
+            while pending:
+                chunk = pending.pop()
+                try:
+                    async with self.async_session.begin_nested():
+                        # Emits the SAVEPOINT, which COPY would not
+                        connection = await self.async_session.connection()
+                        await self._load(connection, table, columns, chunk)
+                except (asyncpg.PostgresError, DBAPIError) as exc:
+                    if len(chunk) == 1:
+                        errors[chunk[0][0]] = str(getattr(exc, "orig", None) or exc)
+                    else:
+                        middle = len(chunk) // 2
+                        pending += [chunk[middle:], chunk[:middle]]
+
+        if commit:
+            await self.async_session.commit()
+        return errors
+
+    async def _load(
+        self,
+        connection: AsyncConnection,
+        table: Table,
+        columns: list[Column[Any]],
+        rows: list[tuple[int, dict[str, Any]]],
+    ) -> None:
+        """Sends `rows`, holding the values of `columns`, in a single statement."""
+        if connection.dialect.driver != "asyncpg":
+            await self.async_session.execute(
+                insert(table), [values for _, values in rows]
+            )
+            return
+
+        processors = [
+            column.type.bind_processor(connection.dialect) for column in columns
+        ]
+        records = [
+            tuple(
+                processor(values[column.name]) if processor else values[column.name]
+                for column, processor in zip(columns, processors)
+            )
+            for _, values in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        if driver is None:
+            raise RuntimeError(
+                f"Cannot COPY into {table.fullname}: the connection has no "
+                "asyncpg connection, it was invalidated or detached"
+            )
+        # COPY goes around the session, which would not see the write
+        self.async_session.info[UNCOMMITTED_WRITES] = True
+        await driver.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=[column.name for column in columns],
+            records=records,
+        )
+
+    async def upsert_many(
+        self,
+        model: Type[T],
+        rows: Sequence[dict[str, Any]],
+        conflict_cols: Sequence[str],
+        update_cols: Sequence[str] | None = None,
+        returning: bool = False,
+        batch_size: int = 1000,
+        commit: bool = True,
+    ) -> list[uuid.UUID]:
+        """
+        Asynchronously inserts `rows`, updating the existing ones on conflict.
+
+        Rows are sent in batches of one `INSERT ... ON CONFLICT DO UPDATE` each, so
+        a sync job costs one round trip per batch instead of a `find_one` plus a
+        `save` or `update` per row, and concurrent upserts of the same key do not
+        race. When several rows share a conflict key, the last one wins.
+
+        Args:
+            model (Type[T]): The model class whose table is upserted.
+            rows (Sequence[dict[str, Any]]): The rows to upsert, keyed by column name.
+                All rows must have the same keys.
+            conflict_cols (Sequence[str]): Columns of the unique constraint or index
+                that detects the conflict.
+            update_cols (Sequence[str], optional): Columns overwritten on conflict.
+                Defaults to every column of the rows except `conflict_cols`. When
+                empty, conflicting rows are left untouched (`DO NOTHING`).
+            returning (bool, optional): Whether to return the ids of the affected
+                rows. Defaults to False.
+            batch_size (int, optional): Maximum number of rows per statement.
+                Defaults to 1000.
+            commit (bool, optional): Whether to commit after the last batch.
+                Defaults to True.
+
+        Returns:
+            list[UUID]: The ids of the inserted or updated rows if `returning`,
+            otherwise an empty list. Rows skipped by `DO NOTHING` are not included.
+        """
+        if not rows:
+            return []
+
+        unique_rows = list(
+            {tuple(row[col] for col in conflict_cols): row for row in rows}.values()
+        )
+        if update_cols is None:
+            update_cols = [col for col in unique_rows[0] if col not in conflict_cols]
+        batch_size = max(1, min(batch_size, MAX_BIND_PARAMETERS // len(unique_rows[0])))
+
+        affected_ids: list[uuid.UUID] = []
+        for start in range(0, len(unique_rows), batch_size):
+            stmt = pg_insert(model).values(unique_rows[start : start + batch_size])
+            if update_cols:
+                set_ = {col: stmt.excluded[col] for col in update_cols}
+                # onupdate defaults are not applied to ON CONFLICT DO UPDATE
+                for column in model.__table__.columns:
+                    if column.onupdate is not None and column.name not in set_:
+                        set_[column.name] = column.onupdate.arg
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_cols, set_=set_
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+
+            # The ids are also needed to invalidate the cached entries
+            if returning or self.cache is not None:
+                result = await self.async_session.execute(stmt.returning(model.id))
+                affected_ids.extend(result.scalars().all())
+            else:
+                await self.async_session.execute(stmt)
+
+        await self._cache_delete(model, affected_ids)
+        if commit:
+            await self.async_session.commit()
+        return affected_ids if returning else []
+
+    @staticmethod
+    def _cache_key(model: Type[T], _id: uuid.UUID) -> str:
+        return f"{model.__tablename__}:{_id}"
+
+    async def _cache_put(self, instance: T, token: Any = None) -> None:
+        """
+        Writes the column values of `instance` through to the cache, or drops its
+        entry when some of them are not loaded. Nothing is written while the
+        transaction of `async_session` has uncommitted writes, which may still be
+        rolled back, nor when the entry was deleted since `token` was taken.
+        """
+        if self.cache is None:
+            return
+        session = self.async_session
+        if session.info.get(UNCOMMITTED_WRITES) or (
+            session.new or session.dirty or session.deleted
+        ):
+            return
+        state = inspect(instance)
+        # Transient and pending instances have no row to cache yet
+        if state.identity is None:
+            return
+        key = self._cache_key(type(instance), state.identity[0])
+        keys = [attr.key for attr in state.mapper.column_attrs]
+        if any(k not in state.dict for k in keys):
+            await self.cache.delete(key)
+        else:
+            await self.cache.set(key, {k: state.dict[k] for k in keys}, token)
+
+    async def _cache_delete(self, model: Type[T], ids: Sequence[uuid.UUID]) -> None:
+        """
+        Deletes the entries of `ids` now and again once the transaction of
+        `async_session` commits, so that an entry cached from the rows read in
+        between is not served after the commit. Called before the commit.
+        """
+        if self.cache is None:
+            return
+        invalidations = self.async_session.info.setdefault(CACHE_INVALIDATIONS, set())
+        for _id in ids:
+            key = self._cache_key(model, _id)
+            await self.cache.delete(key)
+            invalidations.add((self.cache, key))
+
+    async def _from_cache(self, model: Type[T], values: dict[str, Any]) -> T:
+        # Rebuild a detached instance as if it had been loaded, then attach it
+        # without the SELECT that `merge` would otherwise issue
+        instance = model.__mapper__.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        return await self.read_session.merge(instance, load=False)
@@ -1,8 +1,9 @@
 import copy
-from typing import Any, Tuple, Type, TypeVar
+from typing import Any, Hashable, Tuple, Type, TypeVar
 
 from pydantic import BaseModel
 
+from python_api_template.common.base_repository import BaseRepository
 from python_api_template.common.exceptions.exceptions import (
     NotFoundError,
 )
@@ -45,3 +46,21 @@ class BaseService(metaclass=DecoratorMetaclass):
         if result:
             return copy.deepcopy(result)
         raise NotFoundError
+
+    @property
+    def cache_scope(self) -> Hashable:
+        """
+        Part of the key of the results cached by the `cache_config` of the
+        service, shared by the instances of the same scope. Services whose
+        results depend on their state, e.g. a tenant, return it here.
+        """
+        return None
+
+    async def rollback(self) -> None:
+        """
+        Rolls back the sessions of the repositories held by the service. The
+        `retry` decorator calls it before retrying a transient database error.
+        """
+        for value in vars(self).values():
+            if isinstance(value, BaseRepository):
+                await value.rollback()
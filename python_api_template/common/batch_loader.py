@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Generic, Type, TypeVar
+
+from sqlalchemy.exc import NoResultFound
+
+from .models.base_model import BaseOrmModel
+
+if TYPE_CHECKING:
+    from .base_repository import BaseRepository
+
+T = TypeVar("T", bound=BaseOrmModel)
+
+
+class BatchLoader(Generic[T]):
+    """
+    Coalesces the lookups by id of a model into a single query.
+
+    Every `load` made during the same event-loop tick is queued, and the whole
+    queue is resolved on the next tick with one `BaseRepository.find_many`. Each
+    caller gets its own instance back, or `NoResultFound` if the id does not
+    exist, just as with `BaseRepository.find_one`.
+
+    A loader shares the session of its repository, so it lives as long as the
+    request that created the repository. Batches are dispatched one at a time
+    because an `AsyncSession` does not support concurrent queries.
+    """
+
+    def __init__(self, repository: BaseRepository[T], model: Type[T]):
+        self.repository = repository
+        self.model = model
+        self._queue: dict[uuid.UUID, list[asyncio.Future[T]]] = {}
+        self._lock = asyncio.Lock()
+        self._dispatch_scheduled = False
+        self._dispatch_tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, _id: uuid.UUID) -> T:
+        """
+        Asynchronously loads the instance of the model with the given id.
+
+        Args:
+            _id (UUID): The id of the instance.
+
+        Returns:
+            T: The found instance.
+
+        Raises:
+            NoResultFound: If the instance does not exist.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self._queue.setdefault(_id, []).append(future)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self._schedule_dispatch)
+        return await future
+
+    def _schedule_dispatch(self) -> None:
+        # Keep a reference so the task is not garbage collected while running
+        task = asyncio.get_running_loop().create_task(self._dispatch())
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self) -> None:
+        queue, self._queue = self._queue, {}
+        self._dispatch_scheduled = False
+
+        try:
+            async with self._lock:
+                instances = await self.repository.find_many(self.model, list(queue))
+        except Exception as exc:
+            for futures in queue.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        found = {instance.id: instance for instance in instances}
+        for _id, futures in queue.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if _id in found:
+                    future.set_result(found[_id])
+                else:
+                    future.set_exception(
+                        NoResultFound(f"No {self.model.__name__} found with id {_id}")
+                    )
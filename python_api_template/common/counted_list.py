@@ -0,0 +1,23 @@
+from typing import Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class CountedList(list[T], Generic[T]):
+    """
+    The items of a page, along with the metadata requested through `TotalMode`.
+
+    Attributes:
+        total (int, optional): Number of rows matching the query, exact or estimated.
+        has_more (bool, optional): Whether rows exist after this page.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[T] = (),
+        total: int | None = None,
+        has_more: bool | None = None,
+    ):
+        super().__init__(items)
+        self.total = total
+        self.has_more = has_more
@@ -0,0 +1,108 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from prometheus_client import Counter
+
+ENTITY_CACHE_REQUESTS = Counter(
+    "entity_cache_requests",
+    "Lookups of the entity cache made by BaseRepository.find_one",
+    ["model", "result"],
+)
+
+
+class EntityCache(ABC):
+    """
+    Backend of the entity cache used by `BaseRepository.find_one`.
+
+    Entries are keyed by `"<table>:<id>"` and hold the column values of an
+    instance, never the instance itself, so they can outlive the session that
+    loaded them and be stored out of process (e.g. Redis) by another backend.
+
+    A value read from the database before a write was invalidated must not be
+    stored after it: `token` is taken before the read and passed to `set`, which
+    skips the write if `key` was deleted in between.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Returns the column values stored under `key`, or None on a miss.
+        """
+
+    @abstractmethod
+    async def token(self, key: str) -> Any:
+        """
+        Returns the token to pass to `set` for values about to be read.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, values: dict[str, Any], token: Any = None) -> None:
+        """
+        Stores the column values of an instance under `key`, unless `key` was
+        deleted since `token` was taken. Without a token the values are stored.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under `key`, if any.
+        """
+
+
+class InMemoryEntityCache(EntityCache):
+    """
+    Entity cache kept in the memory of the process.
+
+    Entries expire `ttl` seconds after being stored and, once `max_entries` is
+    reached, the least recently used entry is evicted. The cache is local to the
+    worker: a write invalidates the entry of the worker that made it, the other
+    workers may serve the old values until their entry expires.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # Tokens are generations, bumped by every delete. The generation of the
+        # last delete of a key is kept for the `max_entries` latest deletes; older
+        # tokens than the ones forgotten are refused.
+        self._generation = 0
+        self._deleted_at: OrderedDict[str, int] = OrderedDict()
+        self._forgotten_up_to = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return dict(values)
+
+    async def token(self, key: str) -> int:
+        return self._generation
+
+    async def set(self, key: str, values: dict[str, Any], token: Any = None) -> None:
+        if token is not None and (
+            token < self._forgotten_up_to or self._deleted_at.get(key, -1) > token
+        ):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, dict(values))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._deleted_at[key] = self._generation
+        self._deleted_at.move_to_end(key)
+        while len(self._deleted_at) > self.max_entries:
+            _, self._forgotten_up_to = self._deleted_at.popitem(last=False)
@@ -1,8 +1,14 @@
+from .database_topology import DatabaseTopology
+from .export_format import ExportFormat
 from .health_check_status import HealthCheckStatus
 from .sort import SortKey, SortOrder
+from .total_mode import TotalMode
 
 __all__ = [
+    "DatabaseTopology",
+    "ExportFormat",
     "HealthCheckStatus",
     "SortOrder",
     "SortKey",
+    "TotalMode",
 ]
@@ -0,0 +1,21 @@
+from .base_enum import BaseEnum
+
+
+class DatabaseTopology(BaseEnum):
+    """
+    How the application reaches PostgreSQL
+
+    - direct: Straight to the server
+    - pgbouncer_session: Through pgbouncer in session pooling mode
+    - pgbouncer_transaction: Through pgbouncer in transaction pooling mode
+    """
+
+    DIRECT = "direct"
+    PGBOUNCER_SESSION = "pgbouncer_session"
+    PGBOUNCER_TRANSACTION = "pgbouncer_transaction"
+
+    @property
+    def supports_prepared_statements(self) -> bool:
+        # In transaction mode consecutive transactions of a client may run on
+        # different server connections, which do not share prepared statements
+        return self is not DatabaseTopology.PGBOUNCER_TRANSACTION
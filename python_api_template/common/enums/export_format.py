@@ -0,0 +1,20 @@
+from .base_enum import BaseEnum
+
+
+class ExportFormat(BaseEnum):
+    """
+    Format of a streamed export
+
+    - ndjson: Newline delimited JSON, one object per line
+    - csv: Comma separated values, with a header row
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return {
+            ExportFormat.NDJSON: "application/x-ndjson",
+            ExportFormat.CSV: "text/csv",
+        }[self]
@@ -0,0 +1,15 @@
+from .base_enum import BaseEnum
+
+
+class TotalMode(BaseEnum):
+    """
+    How the total of a paginated listing is computed
+
+    - exact: COUNT(*) of the matching rows, costs a second scan
+    - estimated: Planner estimate, from pg_class.reltuples or EXPLAIN
+    - has_more: Only whether a next page exists, by fetching limit + 1 rows
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    HAS_MORE = "has_more"
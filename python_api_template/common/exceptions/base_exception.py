@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable
 
 from fastapi import HTTPException
 from loguru import logger
@@ -17,6 +17,16 @@ def add_url_to_detail(detail: str, url: str) -> str:
     return f"{detail} URL=[{url}]"
 
 
+class LazyDetail:
+    """
+    Detail of an `APIError` computed from `factory` the first time it is read,
+    for errors that are often raised and handled without being rendered.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+
+
 class APIError(HTTPException):
     """
     APIError class represents a custom HTTP exception that extends
@@ -41,6 +51,9 @@ class APIError(HTTPException):
         exception types.
     """
 
+    # Backs `detail`, a `LazyDetail` until it is first read
+    _detail: Any
+
     def __init__(
         self,
         status_code: int,
@@ -53,3 +66,13 @@ class APIError(HTTPException):
         self.url = url
         self.severity = severity
         super().__init__(status_code=status_code, detail=detail)
+
+    @property
+    def detail(self) -> Any:
+        if isinstance(self._detail, LazyDetail):
+            self._detail = self._detail.factory()
+        return self._detail
+
+    @detail.setter
+    def detail(self, detail: Any) -> None:
+        self._detail = detail
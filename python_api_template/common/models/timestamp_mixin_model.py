@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
 from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column
 
 
@@ -14,5 +14,6 @@ class TimestampMixin(MappedAsDataclass):
         default_factory=lambda: datetime.now(timezone.utc),
         nullable=False,
         server_default=func.CURRENT_TIMESTAMP(0),
-        onupdate=func.CURRENT_TIMESTAMP(0),
+        # The precision must be rendered inline, Postgres rejects a bound parameter
+        onupdate=func.CURRENT_TIMESTAMP(literal_column("0")),
     )
@@ -0,0 +1,63 @@
+import base64
+import uuid
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..enums import SortOrder
+from ..exceptions.exceptions import BadRequestError
+
+
+class Cursor(BaseModel):
+    """
+    Position of the last row of a page in a keyset (cursor) paginated listing.
+
+    The cursor holds the value of the sort column and the `id` of the last row
+    returned, so the next page can be fetched with
+    `WHERE (sort_key, id) > (value, id)` instead of `OFFSET`. The sort key and
+    order are stored as well, so a cursor cannot be replayed against a different
+    ordering.
+
+    Attributes:
+        sort_key (str): Name of the column the listing is sorted by.
+        sort_order (SortOrder): Direction of the sort.
+        value (Any): Value of the sort column in the last row of the page.
+        id (UUID): Identifier of the last row of the page, used as tie-breaker.
+    """
+
+    sort_key: str = Field(alias="k")
+    sort_order: SortOrder = Field(alias="o")
+    value: Any = Field(alias="v")
+    id: uuid.UUID = Field(alias="i")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    def encode(self) -> str:
+        """
+        Serializes the cursor into an opaque, URL-safe token.
+
+        Returns:
+            str: The base64url encoded cursor, without padding.
+        """
+        raw = self.model_dump_json(by_alias=True).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """
+        Parses a token produced by `encode`.
+
+        Args:
+            token (str): The opaque cursor received from the client.
+
+        Returns:
+            Cursor: The decoded cursor.
+
+        Raises:
+            BadRequestError: If the token is not a valid cursor.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            return cls.model_validate_json(raw)
+        except ValueError as exc:
+            raise BadRequestError(detail="Invalid cursor") from exc
@@ -1,6 +1,7 @@
 from .api_token import TokenModel
 from .error import Error
 from .health_check_v1 import HealthCheckV1
+from .page_v1 import PageV1
 from .problem_details_v1 import ProblemDetailsV1
 from .validation_problem_details_v1 import ValidationProblemDetailsV1
 
@@ -8,6 +9,7 @@ __all__ = [
     "ValidationProblemDetailsV1",
     "Error",
     "HealthCheckV1",
+    "PageV1",
     "ProblemDetailsV1",
     "TokenModel",
 ]
@@ -0,0 +1,43 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class PageV1(BaseModel, Generic[T]):
+    """
+    A page of a cursor paginated listing.
+
+    Attributes:
+        items (list[T]): The items of the current page.
+        next_cursor (str, optional): Opaque cursor to send back to fetch the next
+        page. It is null when there are no more items.
+        total (int, optional): Number of items matching the filters, exact or
+        estimated, when requested.
+        has_more (bool, optional): Whether there are items after this page, when
+        requested.
+    """
+
+    items: list[T] = Field(
+        default=...,
+        alias="items",
+        description="The items of the current page.",
+    )
+    next_cursor: str | None = Field(
+        default=None,
+        alias="next_cursor",
+        description="Opaque cursor to request the next page. "
+        "Null when there are no more items.",
+    )
+    total: int | None = Field(
+        default=None,
+        alias="total",
+        description="Number of items matching the filters, exact or estimated "
+        "depending on the requested total mode.",
+    )
+    has_more: bool | None = Field(
+        default=None,
+        alias="has_more",
+        description="Whether there are items after this page.",
+    )
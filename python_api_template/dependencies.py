@@ -1,12 +1,62 @@
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, AsyncContextManager, AsyncGenerator, Callable
 
 from fastapi import Depends, Security
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from python_api_template.common.entity_cache import EntityCache, InMemoryEntityCache
 from python_api_template.common.schemas.api_token import TokenModel
-from python_api_template.internal.db.database import get_async_session
+from python_api_template.internal.config.settings import global_settings
+from python_api_template.internal.db.database import (
+    get_async_read_session_factory,
+    get_async_session,
+    get_async_session_factory,
+    sessionmanager,
+)
 from python_api_template.internal.security import get_token_api_key
 
 AsyncSessionDependency = Annotated[AsyncSession, Depends(get_async_session)]
 
+AsyncSessionFactoryDependency = Annotated[
+    Callable[[], AsyncContextManager[AsyncSession]], Depends(get_async_session_factory)
+]
+
+
+async def get_async_read_session(
+    async_session: AsyncSessionDependency,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only queries, opened on a replica when there is one. Without
+    replicas the request session is reused, so no second connection is taken.
+    """
+    if not sessionmanager.has_replicas:
+        yield async_session
+        return
+    async with sessionmanager.read_session() as read_session:
+        yield read_session
+
+
+AsyncReadSessionDependency = Annotated[AsyncSession, Depends(get_async_read_session)]
+
+AsyncReadSessionFactoryDependency = Annotated[
+    Callable[[], AsyncContextManager[AsyncSession]],
+    Depends(get_async_read_session_factory),
+]
+
+
+@lru_cache
+def get_entity_cache() -> EntityCache | None:
+    """
+    Cache of the entities found by id, shared by every request of the worker.
+    """
+    if not global_settings.entity_cache.enabled:
+        return None
+    return InMemoryEntityCache(
+        ttl=global_settings.entity_cache.ttl,
+        max_entries=global_settings.entity_cache.max_entries,
+    )
+
+
+EntityCacheDependency = Annotated[EntityCache | None, Depends(get_entity_cache)]
+
 TokenDependency = Annotated[TokenModel, Security(get_token_api_key)]
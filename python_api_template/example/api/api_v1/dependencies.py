@@ -2,14 +2,36 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from python_api_template.dependencies import AsyncSessionDependency
+from python_api_template.dependencies import (
+    AsyncReadSessionDependency,
+    AsyncSessionDependency,
+    EntityCacheDependency,
+)
 from python_api_template.example.service import ExampleService
 
 
 def get_example_service(
     async_session: AsyncSessionDependency,
+    cache: EntityCacheDependency,
 ) -> ExampleService:
-    return ExampleService(async_session)
+    return ExampleService(async_session, cache=cache)
+
+
+def get_example_read_service(
+    async_session: AsyncSessionDependency,
+    read_session: AsyncReadSessionDependency,
+    cache: EntityCacheDependency,
+) -> ExampleService:
+    """
+    Service of the read-only endpoints, whose queries may be sent to a replica.
+    Endpoints that write use `get_example_service`, so they never open a session
+    on a replica nor check its replication lag.
+    """
+    return ExampleService(async_session, read_session, cache)
 
 
 ExampleServiceDependency = Annotated[ExampleService, Depends(get_example_service)]
+
+ExampleReadServiceDependency = Annotated[
+    ExampleService, Depends(get_example_read_service)
+]
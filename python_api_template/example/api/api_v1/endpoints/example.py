@@ -1,18 +1,28 @@
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Body, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from starlette import status
 
+from python_api_template.common.enums.export_format import ExportFormat
 from python_api_template.common.enums.sort import SortOrder
+from python_api_template.common.enums.total_mode import TotalMode
+from python_api_template.common.schemas.page_v1 import PageV1
 from python_api_template.common.schemas.problem_details_v1 import ProblemDetailsV1
 from python_api_template.example.enums.example_sort_key import ExampleSortKey
 from python_api_template.example.enums.example_status import ExampleStatusEnum
-from python_api_template.example.schemas import CreateExampleSchema, GetExampleSchema
+from python_api_template.dependencies import AsyncReadSessionFactoryDependency
+from python_api_template.example.schemas import (
+    BulkCreateExampleSchema,
+    CreateExampleSchema,
+    GetExampleSchema,
+)
+from python_api_template.example.service import ExampleService
 
-from ..dependencies import ExampleServiceDependency
+from ..dependencies import ExampleReadServiceDependency, ExampleServiceDependency
 
 router = APIRouter()
 
@@ -22,7 +32,8 @@ router = APIRouter()
     responses={
         status.HTTP_200_OK: {
             "model": list[GetExampleSchema],
-            "description": "List of all examples",
+            "description": "List of all examples. With `total`, the metadata is "
+            "returned in the `X-Total-Count` or `X-Has-More` header",
         },
         status.HTTP_400_BAD_REQUEST: {
             "model": ProblemDetailsV1,
@@ -61,7 +72,8 @@ router = APIRouter()
     response_model_by_alias=True,
 )
 async def get_examples(
-    example_service: ExampleServiceDependency,
+    response: Response,
+    example_service: ExampleReadServiceDependency,
     example_date: Optional[date] = Query(
         None, description="Start of next_payment_date"
     ),
@@ -86,14 +98,181 @@ async def get_examples(
         ge=0,
         le=100,
     ),
+    total: Optional[TotalMode] = Query(
+        None, description="Total metadata to return along with the items"
+    ),
 ):
-    return await example_service.get_example(
+    examples = await example_service.get_example(
         example_date,
         example_status,
         sort_order,
         sort_key,
         skip,
         limit,
+        total,
+    )
+    if examples.total is not None:
+        response.headers["X-Total-Count"] = str(examples.total)
+    if examples.has_more is not None:
+        response.headers["X-Has-More"] = str(examples.has_more).lower()
+    return examples
+
+
+@router.get(
+    "/page",
+    responses={
+        status.HTTP_200_OK: {
+            "model": PageV1[GetExampleSchema],
+            "description": "Page of examples and cursor of the next page",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ProblemDetailsV1,
+            "description": "Bad Request",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "model": ProblemDetailsV1,
+            "description": "Unauthorized",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "model": ProblemDetailsV1,
+            "description": "Forbidden",
+        },
+        status.HTTP_406_NOT_ACCEPTABLE: {
+            "model": ProblemDetailsV1,
+            "description": "Not acceptable",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "model": ProblemDetailsV1,
+            "description": "Validation Error",
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "model": ProblemDetailsV1,
+            "description": "Too many requests",
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "model": ProblemDetailsV1,
+            "description": "Internal error",
+        },
+    },
+    response_model=PageV1[GetExampleSchema],
+    summary="Returns a page of examples using cursor pagination",
+    response_model_by_alias=True,
+)
+async def get_examples_page(
+    example_service: ExampleReadServiceDependency,
+    example_date: Optional[date] = Query(
+        None, description="Start of next_payment_date"
+    ),
+    example_status: ExampleStatusEnum = Query(
+        ExampleStatusEnum.A, description="Status of example"
+    ),
+    sort_order: SortOrder = Query(
+        SortOrder.ASC, description="Order of the items listed"
+    ),
+    sort_key: ExampleSortKey = Query(
+        ExampleSortKey.STATUS, description="Field used for sorting"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor returned as `next_cursor` by the previous page",
+        max_length=512,
+    ),
+    limit: int = Query(
+        20,
+        description="Maximum number of items to be returned at the same time",
+        ge=1,
+        le=100,
+    ),
+    total: Optional[TotalMode] = Query(
+        None, description="Total metadata to return along with the items"
+    ),
+):
+    return await example_service.get_example_page(
+        example_date,
+        example_status,
+        sort_order,
+        sort_key,
+        cursor,
+        limit,
+        total,
+    )
+
+
+@router.get(
+    "/export",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                ExportFormat.NDJSON.media_type: {},
+                ExportFormat.CSV.media_type: {},
+            },
+            "description": "Stream of all the examples matching the filters",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ProblemDetailsV1,
+            "description": "Bad Request",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "model": ProblemDetailsV1,
+            "description": "Unauthorized",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "model": ProblemDetailsV1,
+            "description": "Forbidden",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "model": ProblemDetailsV1,
+            "description": "Validation Error",
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "model": ProblemDetailsV1,
+            "description": "Too many requests",
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "model": ProblemDetailsV1,
+            "description": "Internal error",
+        },
+    },
+    response_class=StreamingResponse,
+    summary="Streams all the examples as NDJSON or CSV",
+)
+async def export_examples(
+    session_factory: AsyncReadSessionFactoryDependency,
+    example_date: Optional[date] = Query(
+        None, description="Start of next_payment_date"
+    ),
+    example_status: ExampleStatusEnum = Query(
+        ExampleStatusEnum.A, description="Status of example"
+    ),
+    sort_order: SortOrder = Query(
+        SortOrder.ASC, description="Order of the items listed"
+    ),
+    sort_key: ExampleSortKey = Query(
+        ExampleSortKey.STATUS, description="Field used for sorting"
+    ),
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="Format of the export"
+    ),
+):
+    async def content():
+        # The request scoped session is closed before the body is streamed,
+        # so the export holds its own session until the last row is sent.
+        async with session_factory() as async_session:
+            async for chunk in ExampleService(async_session).export_example(
+                example_date,
+                example_status,
+                sort_order,
+                sort_key,
+                export_format,
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=examples.{export_format.value}"
+        },
     )
 
 
@@ -142,7 +321,7 @@ async def get_examples(
 )
 async def get_example(
     example_id: UUID,
-    example_service: ExampleServiceDependency,
+    example_service: ExampleReadServiceDependency,
 ):
     return await example_service.get_example_by_id(example_id)
 
@@ -197,6 +376,57 @@ async def create_example(
     return await example_service.create(example_schema)
 
 
+@router.post(
+    "/bulk",
+    responses={
+        status.HTTP_200_OK: {
+            "model": BulkCreateExampleSchema,
+            "description": "Outcome of every item of the batch",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ProblemDetailsV1,
+            "description": "Bad Request",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "model": ProblemDetailsV1,
+            "description": "Unauthorized",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "model": ProblemDetailsV1,
+            "description": "Forbidden",
+        },
+        status.HTTP_409_CONFLICT: {
+            "model": ProblemDetailsV1,
+            "description": "Conflict",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "model": ProblemDetailsV1,
+            "description": "Validation Error",
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "model": ProblemDetailsV1,
+            "description": "Too many requests",
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "model": ProblemDetailsV1,
+            "description": "Internal error",
+        },
+    },
+    response_model=BulkCreateExampleSchema,
+    description="Creates a batch of examples. Every item is validated on its own; "
+    "valid items are loaded in bulk and invalid ones are reported with their errors",
+)
+async def bulk_create_examples(
+    example_service: ExampleServiceDependency,
+    items: list[dict[str, Any]] = Body(
+        ...,
+        description="Examples to create, each one following the create example schema",
+        max_length=10000,
+    ),
+):
+    return await example_service.bulk_create(items)
+
+
 @router.delete("/{example_id}")
 async def delete_example(
     example_id: UUID,
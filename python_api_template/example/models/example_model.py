@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from python_api_template.common.models.base_model import BaseOrmModel
@@ -11,6 +11,13 @@ from python_api_template.example.enums import ExampleStatusEnum
 
 
 class ExampleModel(BaseOrmModel, UuidMixin, TimestampMixin):
+    # Composite indexes backing keyset pagination on every ExampleSortKey,
+    # `id` is the tie-breaker of the `(sort_key, id)` cursor.
+    __table_args__ = (
+        Index("ix__example__example_status_id", "example_status", "id"),
+        Index("ix__example__example_date_id", "example_date", "id"),
+    )
+
     example_name: Mapped[str_255] = mapped_column(
         CheckConstraint(
             r"example_name ~ '^[a-zA-Z0-9\s\-_.]{1,255}$'", name="example_name_check"
@@ -1,13 +1,14 @@
 from datetime import date
-from typing import Any
+from typing import Any, AsyncIterator, Sequence
 
-from sqlalchemy import Select, asc, desc, select
+from sqlalchemy import Select, select
 
-from python_api_template.common.enums.base_enum import BaseEnum
 from python_api_template.common.enums.sort import SortOrder
+from python_api_template.common.enums.total_mode import TotalMode
 from python_api_template.example.enums.example_sort_key import ExampleSortKey
 
 from ..common.base_repository import BaseRepository
+from ..common.counted_list import CountedList
 from .enums import ExampleStatusEnum
 from .models.example_model import ExampleModel
 
@@ -21,26 +22,41 @@ class ExampleRepository(BaseRepository[ExampleModel]):
         sort_key: ExampleSortKey,
         skip: int,
         limit: int,
-    ):
-        stmt = select(ExampleModel)
-
-        if example_date:
-            stmt = stmt.where(ExampleModel.example_date >= example_date)
-        if example_status:
-            stmt = stmt.where(ExampleModel.example_status == example_status)
+        cursor: str | None = None,
+        total: TotalMode | None = None,
+    ) -> CountedList[ExampleModel]:
+        stmt = self._filter_example(select(ExampleModel), example_date, example_status)
+        count_stmt = stmt
         if sort_order:
-            stmt = self._order_by(stmt, sort_order, sort_key)
+            stmt = self._keyset(stmt, ExampleModel, sort_key.value, sort_order, cursor)
+        if cursor is None:
+            stmt = stmt.offset(skip)
 
-        stmt = stmt.offset(skip).limit(limit)
+        return await self.find_page(stmt, limit, total, count_stmt)
+
+    async def stream_example(
+        self,
+        example_date: date | None,
+        example_status: ExampleStatusEnum,
+        sort_order: SortOrder,
+        sort_key: ExampleSortKey,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[ExampleModel]]:
+        stmt = self._filter_example(select(ExampleModel), example_date, example_status)
+        stmt = self._keyset(stmt, ExampleModel, sort_key.value, sort_order, None)
 
-        return (await self.async_session.execute(stmt)).scalars().all()
+        async for batch in self.stream(stmt, batch_size):
+            yield batch
 
     @classmethod
-    def _order_by(
+    def _filter_example(
         cls,
         stmt: Select[Any],
-        sort_order: SortOrder,
-        sort_key: BaseEnum,
+        example_date: date | None,
+        example_status: ExampleStatusEnum,
     ) -> Select[Any]:
-        sort_func = asc if sort_order == SortOrder.ASC else desc
-        return stmt.order_by(sort_func(getattr(ExampleModel, sort_key.value)))
+        if example_date:
+            stmt = stmt.where(ExampleModel.example_date >= example_date)
+        if example_status:
+            stmt = stmt.where(ExampleModel.example_status == example_status)
+        return stmt
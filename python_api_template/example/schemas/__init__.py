@@ -1,9 +1,15 @@
 from python_api_template.example.schemas.base_example import BaseExampleSchema
+from python_api_template.example.schemas.bulk_create_example import (
+    BulkCreateExampleItemSchema,
+    BulkCreateExampleSchema,
+)
 from python_api_template.example.schemas.create_example import CreateExampleSchema
 from python_api_template.example.schemas.get_example import GetExampleSchema
 
 __all__ = [
     "BaseExampleSchema",
+    "BulkCreateExampleItemSchema",
+    "BulkCreateExampleSchema",
     "CreateExampleSchema",
     "GetExampleSchema",
 ]
@@ -0,0 +1,46 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from python_api_template.common.schemas.error import Error
+
+
+class BulkCreateExampleItemSchema(BaseModel):
+    """
+    Outcome of a single item of a bulk create request.
+
+    Attributes:
+        index (int): Position of the item in the request body.
+        id (UUID, optional): Identifier of the created 'example', if it was valid.
+        errors (list[Error], optional): Errors of the item, if it was rejected.
+    """
+
+    index: int = Field(
+        alias="index",
+        description="Position of the item in the request body.",
+    )
+    id: UUID | None = Field(
+        default=None,
+        alias="id",
+        description="The unique identifier of the created 'example'.",
+    )
+    errors: list[Error] | None = Field(
+        default=None,
+        alias="errors",
+        description="Validation or database errors of the item, if it was rejected.",
+    )
+
+
+class BulkCreateExampleSchema(BaseModel):
+    """
+    Result of a bulk create request, with one entry per item of the request.
+    """
+
+    created: int = Field(alias="created", description="Number of 'examples' created.")
+    rejected: int = Field(
+        alias="rejected",
+        description="Number of items rejected by validation or by the database.",
+    )
+    items: list[BulkCreateExampleItemSchema] = Field(
+        alias="items", description="Outcome of every item, in request order."
+    )
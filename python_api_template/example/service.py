@@ -1,20 +1,54 @@
+import csv
+import io
 from datetime import date, datetime, time
-from uuid import UUID
+from typing import Any, AsyncIterator
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from python_api_template.common.base_service import BaseService
+from python_api_template.common.entity_cache import EntityCache
+from python_api_template.common.schemas.error import Error
+from python_api_template.common.schemas.page_v1 import PageV1
+from python_api_template.internal.config.settings import global_settings
+from python_api_template.internal.db.database import get_async_session_factory
+from python_api_template.internal.decorators.cache_decorator import CacheConfig
+from python_api_template.internal.http.utils import format_validation_errors
 
-from ..common.enums import SortOrder
+from ..common.counted_list import CountedList
+from ..common.enums import ExportFormat, SortOrder, TotalMode
 from .enums import ExampleSortKey, ExampleStatusEnum
 from .models import ExampleModel
 from .repository import ExampleRepository
-from .schemas import CreateExampleSchema, GetExampleSchema
+from .schemas import (
+    BulkCreateExampleItemSchema,
+    BulkCreateExampleSchema,
+    CreateExampleSchema,
+    GetExampleSchema,
+)
 
 
 class ExampleService(BaseService):
-    def __init__(self, async_session: AsyncSession):
-        self.repository = ExampleRepository(async_session)
+    # The listings are loaded on a session of their own, on the primary, so that
+    # a result read on a lagging replica is not cached after a write cleared it
+    cache_config = CacheConfig(
+        enabled=global_settings.service_cache.enabled,
+        methods=("get_example", "get_example_page"),
+        ttl=global_settings.service_cache.ttl,
+        max_entries=global_settings.service_cache.max_entries,
+        session_factory=get_async_session_factory(),
+        invalidated_by=("create", "bulk_create", "delete"),
+    )
+
+    def __init__(
+        self,
+        async_session: AsyncSession,
+        read_session: AsyncSession | None = None,
+        cache: EntityCache | None = None,
+    ):
+        self.repository = ExampleRepository(async_session, read_session, cache)
 
     async def get_example(
         self,
@@ -24,7 +58,8 @@ class ExampleService(BaseService):
         sort_key: ExampleSortKey = ExampleSortKey.STATUS,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[GetExampleSchema]:
+        total: TotalMode | None = None,
+    ) -> CountedList[GetExampleSchema]:
         _example_date = datetime.combine(example_date, time()) if example_date else None
 
         examples = await self.repository.find_example(
@@ -34,8 +69,78 @@ class ExampleService(BaseService):
             sort_key=sort_key,
             skip=skip,
             limit=limit,
+            total=total,
         )
-        return list(map(GetExampleSchema.model_validate, examples))
+        return CountedList(
+            list(map(GetExampleSchema.model_validate, examples)),
+            total=examples.total,
+            has_more=examples.has_more,
+        )
+
+    async def get_example_page(
+        self,
+        example_date: date,
+        example_status: ExampleStatusEnum,
+        sort_order: SortOrder = SortOrder.ASC,
+        sort_key: ExampleSortKey = ExampleSortKey.STATUS,
+        cursor: str | None = None,
+        limit: int = 100,
+        total: TotalMode | None = None,
+    ) -> PageV1[GetExampleSchema]:
+        _example_date = datetime.combine(example_date, time()) if example_date else None
+
+        examples = await self.repository.find_example(
+            example_date=_example_date,
+            example_status=example_status,
+            sort_order=sort_order,
+            sort_key=sort_key,
+            skip=0,
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
+        next_cursor = None
+        if examples.has_more is not False:
+            next_cursor = self.repository.next_cursor(
+                examples, limit, sort_key.value, sort_order
+            )
+        return PageV1[GetExampleSchema](
+            items=list(map(GetExampleSchema.model_validate, examples)),
+            next_cursor=next_cursor,
+            total=examples.total,
+            has_more=examples.has_more,
+        )
+
+    async def export_example(
+        self,
+        example_date: date,
+        example_status: ExampleStatusEnum,
+        sort_order: SortOrder = SortOrder.ASC,
+        sort_key: ExampleSortKey = ExampleSortKey.STATUS,
+        export_format: ExportFormat = ExportFormat.NDJSON,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        _example_date = datetime.combine(example_date, time()) if example_date else None
+        fields = list(GetExampleSchema.model_fields)
+
+        if export_format == ExportFormat.CSV:
+            yield self._to_csv([fields])
+
+        async for examples in self.repository.stream_example(
+            example_date=_example_date,
+            example_status=example_status,
+            sort_order=sort_order,
+            sort_key=sort_key,
+            batch_size=batch_size,
+        ):
+            schemas = map(GetExampleSchema.model_validate, examples)
+            if export_format == ExportFormat.CSV:
+                rows = (schema.model_dump(mode="json") for schema in schemas)
+                yield self._to_csv([[row[field] for field in fields] for row in rows])
+            else:
+                yield b"".join(
+                    schema.model_dump_json().encode() + b"\n" for schema in schemas
+                )
 
     async def get_example_by_id(self, example_id: UUID) -> GetExampleSchema:
         payment_calendar = await self.repository.find_one(ExampleModel, example_id)
@@ -49,9 +154,48 @@ class ExampleService(BaseService):
             example_status=example_schema.example_status,
             example_boolean=example_schema.example_boolean,
         )
-        example = await self.repository.save(example_model)
+        example = await self.repository.save(example_model, refresh=False)
 
         return GetExampleSchema.model_validate(example)
 
+    async def bulk_create(self, items: list[dict[str, Any]]) -> BulkCreateExampleSchema:
+        results: list[BulkCreateExampleItemSchema] = []
+        rows: list[dict[str, Any]] = []
+        for index, item in enumerate(items):
+            try:
+                example_schema = CreateExampleSchema.model_validate(item)
+            except ValidationError as exc:
+                results.append(
+                    BulkCreateExampleItemSchema(
+                        index=index, errors=format_validation_errors(exc.errors())
+                    )
+                )
+                continue
+            example_id = uuid4()
+            rows.append(
+                {"id": example_id, **example_schema.model_dump(exclude_none=True)}
+            )
+            results.append(BulkCreateExampleItemSchema(index=index, id=example_id))
+
+        errors = iter(await self.repository.copy_insert(ExampleModel, rows))
+        for result in results:
+            if result.id is None:
+                continue
+            error = next(errors)
+            if error is not None:
+                result.id = None
+                result.errors = [Error(message=" ".join(error.split())[:255].rstrip())]
+
+        created = sum(result.id is not None for result in results)
+        return BulkCreateExampleSchema(
+            created=created, rejected=len(items) - created, items=results
+        )
+
     async def delete(self, example_id: UUID):
         await self.repository.delete(ExampleModel, example_id)
+
+    @staticmethod
+    def _to_csv(rows: list[list[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
@@ -13,6 +13,7 @@ from pydantic import (
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from python_api_template.common.enums import DatabaseTopology
 from python_api_template.internal.config.utils import (
     find_base_path,
     get_project_info,
@@ -107,6 +108,116 @@ class HttpSettings(CommonSettings):
     timeout: float = Field(default=30, gt=0, validation_alias="HTTP_TIMEOUT")
     max_attempts: int = Field(default=3, gt=0, validation_alias="HTTP_MAX_ATTEMPTS")
     time_sleep: float = Field(default=0.3, gt=0, validation_alias="HTTP_TIME_SLEEP")
+    # Upper bound of the backoff between attempts, and of an honored Retry-After.
+    backoff_max: float = Field(default=10, gt=0, validation_alias="HTTP_BACKOFF_MAX")
+    # Statuses retried for idempotent methods (GET, PUT); 429 is always retried.
+    retry_statuses: list[int] = Field(
+        default=[502, 503, 504], validation_alias="HTTP_RETRY_STATUSES"
+    )
+    # Retries per host are capped to this fraction of its requests ...
+    retry_budget_ratio: float = Field(
+        default=0.1, ge=0, validation_alias="HTTP_RETRY_BUDGET_RATIO"
+    )
+    # ... but this many retries are always allowed within the window.
+    retry_budget_min_retries: int = Field(
+        default=10, ge=0, validation_alias="HTTP_RETRY_BUDGET_MIN_RETRIES"
+    )
+    # Seconds over which requests and retries are counted.
+    retry_budget_window: float = Field(
+        default=10, gt=0, validation_alias="HTTP_RETRY_BUDGET_WINDOW"
+    )
+    # Share of failed or slow calls, among the last ones, that opens the breaker.
+    circuit_failure_rate: float = Field(
+        default=0.5, gt=0, le=1, validation_alias="HTTP_CIRCUIT_FAILURE_RATE"
+    )
+    # Calls taking at least this many seconds count as failures.
+    circuit_slow_call_duration: float = Field(
+        default=5, gt=0, validation_alias="HTTP_CIRCUIT_SLOW_CALL_DURATION"
+    )
+    # Number of last calls whose outcome is considered.
+    circuit_window_size: int = Field(
+        default=20, gt=0, validation_alias="HTTP_CIRCUIT_WINDOW_SIZE"
+    )
+    # Calls recorded before the failure rate is evaluated.
+    circuit_minimum_calls: int = Field(
+        default=10, gt=0, validation_alias="HTTP_CIRCUIT_MINIMUM_CALLS"
+    )
+    # Seconds the breaker stays open before letting probe calls through.
+    circuit_open_duration: float = Field(
+        default=30, gt=0, validation_alias="HTTP_CIRCUIT_OPEN_DURATION"
+    )
+    # Successful probe calls needed to close the breaker again.
+    circuit_half_open_calls: int = Field(
+        default=3, gt=0, validation_alias="HTTP_CIRCUIT_HALF_OPEN_CALLS"
+    )
+    # Size of the bodies and headers kept by the shared GET response cache.
+    response_cache_max_bytes: int = Field(
+        default=50 * 1024 * 1024,
+        ge=0,
+        validation_alias="HTTP_RESPONSE_CACHE_MAX_BYTES",
+    )
+    # Connections open at once to each upstream origin.
+    max_connections: int = Field(
+        default=100, gt=0, validation_alias="HTTP_MAX_CONNECTIONS"
+    )
+    # Idle connections kept alive for reuse per upstream origin.
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, validation_alias="HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    # Seconds an idle connection is kept before being closed.
+    keepalive_expiry: float = Field(
+        default=5.0, ge=0, validation_alias="HTTP_KEEPALIVE_EXPIRY"
+    )
+    # Negotiate HTTP/2 with the upstreams that support it.
+    http2: bool = Field(default=False, validation_alias="HTTP_HTTP2")
+    # Hedged GETs are sent again once slower than this percentile of latencies ...
+    hedge_percentile: float = Field(
+        default=0.95, gt=0, le=1, validation_alias="HTTP_HEDGE_PERCENTILE"
+    )
+    # ... or than this many seconds, until enough latencies were observed.
+    hedge_initial_delay: float = Field(
+        default=0.5, gt=0, validation_alias="HTTP_HEDGE_INITIAL_DELAY"
+    )
+    # Successful calls observed before the percentile is used.
+    hedge_min_samples: int = Field(
+        default=20, gt=0, validation_alias="HTTP_HEDGE_MIN_SAMPLES"
+    )
+    # The percentile is computed again once this many latencies were observed.
+    hedge_recompute_every: int = Field(
+        default=50, gt=0, validation_alias="HTTP_HEDGE_RECOMPUTE_EVERY"
+    )
+    # Hedges per host are capped to this fraction of its hedgeable requests.
+    hedge_max_ratio: float = Field(
+        default=0.05, ge=0, validation_alias="HTTP_HEDGE_MAX_RATIO"
+    )
+    # Seconds over which requests and hedges are counted.
+    hedge_window: float = Field(default=10, gt=0, validation_alias="HTTP_HEDGE_WINDOW")
+
+
+class EntityCacheSettings(CommonSettings):
+    """Entity Cache Settings"""
+
+    # Whether `find_one` lookups by id are cached. The cache lives in each worker,
+    # so a write made on another worker is only seen once the entry expires.
+    enabled: bool = Field(False, validation_alias="ENTITY_CACHE_ENABLED")
+    # Seconds an entry is served before it is loaded again.
+    ttl: float = Field(60, gt=0, validation_alias="ENTITY_CACHE_TTL")
+    # Entries kept per worker, the least recently used are evicted first.
+    max_entries: int = Field(10_000, gt=0, validation_alias="ENTITY_CACHE_MAX_ENTRIES")
+
+
+class ServiceCacheSettings(CommonSettings):
+    """Service Cache Settings"""
+
+    # Whether the services cache the results of the methods listed by their
+    # `cache_config`. The cache lives in each worker and is cleared by the writes
+    # of the worker, so a write made on another worker is only seen once the
+    # results expire.
+    enabled: bool = Field(False, validation_alias="SERVICE_CACHE_ENABLED")
+    # Seconds a result is served before it is loaded again.
+    ttl: float = Field(5, gt=0, validation_alias="SERVICE_CACHE_TTL")
+    # Results kept per method and worker, the least recently used are evicted first.
+    max_entries: int = Field(1024, gt=0, validation_alias="SERVICE_CACHE_MAX_ENTRIES")
 
 
 class PostgresDatabaseSettings(CommonSettings):
@@ -131,6 +242,28 @@ class PostgresDatabaseSettings(CommonSettings):
     exclude_tables: list[str] = Field(
         default_factory=list, validation_alias="DB_EXCLUDE_TABLES"
     )
+    # DSNs of the read replicas, read-only queries are routed to them when set.
+    replica_urls: list[str] = Field(
+        default_factory=list, validation_alias="POSTGRES_REPLICA_URLS"
+    )
+    # Replicas lagging behind the primary by more seconds than this are skipped.
+    max_replication_lag: float = Field(
+        5.0, ge=0, validation_alias="POSTGRES_MAX_REPLICATION_LAG"
+    )
+    # Seconds during which the measured lag of a replica is reused.
+    replication_lag_check_interval: float = Field(
+        1.0, gt=0, validation_alias="POSTGRES_REPLICATION_LAG_CHECK_INTERVAL"
+    )
+    # How the application reaches the server, prepared statements are only
+    # cached when the topology allows it. Defaults to pgbouncer in transaction
+    # mode, which works everywhere; direct connections must opt in.
+    topology: DatabaseTopology = Field(
+        DatabaseTopology.PGBOUNCER_TRANSACTION, validation_alias="POSTGRES_TOPOLOGY"
+    )
+    # Number of prepared statements cached per connection, 0 disables the cache.
+    statement_cache_size: int = Field(
+        100, ge=0, validation_alias="POSTGRES_STATEMENT_CACHE_SIZE"
+    )
 
     @field_validator("host")
     @classmethod
@@ -187,6 +320,8 @@ class Settings(BaseModel):
     postgres: PostgresDatabaseSettings = PostgresDatabaseSettings()  # type: ignore
     gunicorn: GunicornSettings = GunicornSettings()  # type: ignore
     http: HttpSettings = HttpSettings()  # type: ignore
+    entity_cache: EntityCacheSettings = EntityCacheSettings()  # type: ignore
+    service_cache: ServiceCacheSettings = ServiceCacheSettings()  # type: ignore
     app: AppSettings = AppSettings(pg_url=postgres.url)  # type: ignore
 
 
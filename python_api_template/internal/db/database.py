@@ -1,6 +1,17 @@
 import contextlib
+import itertools
+import math
+import time
 import traceback
-from typing import Any, AsyncGenerator, AsyncIterator
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Iterator,
+)
 
 from loguru import logger
 from sqlalchemy import text
@@ -14,6 +25,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base
 
+from python_api_template.common.enums import DatabaseTopology
 from python_api_template.common.exceptions.exceptions import (
     ForeignKeyError,
     ORMError,
@@ -53,34 +65,89 @@ class DatabaseSessionManager:
         self._engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
         self._db_url = None
+        self._replicas: list[Replica] = []
+        self._replica_cycle: Iterator[Replica] = iter(())
+        self._max_replication_lag = 0.0
+        self._replication_lag_check_interval = 0.0
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseSessionManager, cls).__new__(cls)
             cls._instance._engine = None
             cls._instance._sessionmaker = None
+            cls._instance._replicas = []
         return cls._instance
 
-    def init(self, db_url: str, pool_size: int):
+    def init(
+        self,
+        db_url: str,
+        pool_size: int,
+        replica_urls: list[str] | None = None,
+        max_replication_lag: float = 5.0,
+        replication_lag_check_interval: float = 1.0,
+        topology: DatabaseTopology = DatabaseTopology.PGBOUNCER_TRANSACTION,
+        statement_cache_size: int = 100,
+    ):
+        """
+        Creates the engine of the primary and, optionally, one engine per replica.
+
+        Args:
+            db_url (str): DSN of the primary.
+            pool_size (int): Size of the connection pool of every engine.
+            replica_urls (list[str], optional): DSNs of the read replicas.
+            max_replication_lag (float, optional): Replicas lagging behind the
+                primary by more than this many seconds are not used for reads.
+            replication_lag_check_interval (float, optional): Seconds during which
+                the measured lag of a replica is reused before querying it again.
+            topology (DatabaseTopology, optional): How the servers are reached.
+                Defaults to pgbouncer in transaction mode, which disables
+                prepared statements.
+            statement_cache_size (int, optional): Number of prepared statements
+                cached per connection when the topology allows it.
+        """
         self._db_url = db_url
-        if "postgresql" in db_url:
-            # These settings are needed to work with pgbouncer in transaction mode
-            # because you can't use prepared statements in such case
-            connect_args = {
-                "statement_cache_size": 0,
-                "prepared_statement_cache_size": 0,
-            }
-        else:
-            connect_args = {}
+        connect_args = self._connect_args(db_url, topology, statement_cache_size)
         self._engine = get_async_sql_engine(self._db_url, pool_size, connect_args)
         self._sessionmaker = get_async_sessionmaker(self._engine)
 
+        self._replicas = []
+        for replica_url in replica_urls or []:
+            engine = get_async_sql_engine(replica_url, pool_size, connect_args)
+            self._replicas.append(Replica(engine, get_async_sessionmaker(engine)))
+        self._replica_cycle = itertools.cycle(self._replicas)
+        self._max_replication_lag = max_replication_lag
+        self._replication_lag_check_interval = replication_lag_check_interval
+
+    @staticmethod
+    def _connect_args(
+        db_url: str, topology: DatabaseTopology, statement_cache_size: int
+    ) -> dict[str, Any]:
+        if "postgresql" not in db_url:
+            return {}
+        if not topology.supports_prepared_statements:
+            # pgbouncer in transaction mode may run each transaction on a different
+            # server connection, so prepared statements can't be reused
+            statement_cache_size = 0
+        return {
+            # Statements prepared by asyncpg on each connection
+            "statement_cache_size": statement_cache_size,
+            # Prepared statement handles kept by the SQLAlchemy dialect
+            "prepared_statement_cache_size": statement_cache_size,
+        }
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
         self._engine = None
         self._sessionmaker = None
+        self._replicas = []
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -97,7 +164,57 @@ class DatabaseSessionManager:
     async def session(self) -> AsyncIterator[AsyncSession]:
         if self._sessionmaker is None:
             raise IOError("DatabaseSessionManager is not initialized")
-        async with self._sessionmaker() as session:
+        async with self._session(self._sessionmaker) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Opens a session on a read replica, or on the primary if there is no replica
+        or every replica lags behind by more than `max_replication_lag`.
+        """
+        if self._sessionmaker is None:
+            raise IOError("DatabaseSessionManager is not initialized")
+        replica = await self._pick_replica()
+        sessionmaker = replica.sessionmaker if replica else self._sessionmaker
+        async with self._session(sessionmaker) as session:
+            yield session
+
+    async def _pick_replica(self) -> "Replica | None":
+        for _ in range(len(self._replicas)):
+            replica = next(self._replica_cycle)
+            if await self._replication_lag(replica) <= self._max_replication_lag:
+                return replica
+        if self._replicas:
+            logger.warning("All replicas are lagging, reading from the primary")
+        return None
+
+    async def _replication_lag(self, replica: "Replica") -> float:
+        now = time.monotonic()
+        if now - replica.lag_checked_at < self._replication_lag_check_interval:
+            return replica.lag
+        # Concurrent requests keep using the last measure while this one runs
+        replica.lag_checked_at = now
+        try:
+            async with replica.engine.connect() as connection:
+                lag = await connection.scalar(
+                    text(
+                        "SELECT EXTRACT(EPOCH FROM "
+                        "now() - pg_last_xact_replay_timestamp())"
+                    )
+                )
+            # NULL means the server is not replaying WAL, so it cannot lag behind
+            replica.lag = float(lag) if lag is not None else 0.0
+        except (OSError, SQLAlchemyError) as exc:
+            logger.warning(f"Replica {replica.engine.url!r} is unreachable: {exc}")
+            replica.lag = math.inf
+        return replica.lag
+
+    @contextlib.asynccontextmanager
+    async def _session(
+        self, sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> AsyncIterator[AsyncSession]:
+        async with sessionmaker() as session:
             try:
                 yield session
             except IntegrityError as exc:
@@ -123,6 +240,15 @@ class DatabaseSessionManager:
                 await session.close()
 
 
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    # Unknown until measured, so the replica is not read before its first check
+    lag: float = math.inf
+    lag_checked_at: float = -math.inf
+
+
 sessionmanager = DatabaseSessionManager()
 
 
@@ -131,6 +257,21 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield async_session
 
 
+def get_async_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """
+    Provides a factory of sessions not bound to the request scope.
+
+    Sessions yielded by `get_async_session` are closed before a streamed response
+    body is sent, so streaming endpoints open their own session with this factory.
+    """
+    return sessionmanager.session
+
+
+def get_async_read_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Same as `get_async_session_factory`, with sessions routed to the replicas."""
+    return sessionmanager.read_session
+
+
 async def perform_db_healthcheck(async_session: AsyncSession) -> bool:
     try:
         result = await async_session.execute(text("SELECT 1;"))
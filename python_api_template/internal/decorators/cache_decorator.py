@@ -0,0 +1,186 @@
+import copy
+import inspect
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, AsyncContextManager, Awaitable, Callable, Hashable, TypeVar
+
+from prometheus_client import Counter
+from pydantic import BaseModel, Field
+
+from python_api_template.internal.utils.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+SERVICE_CACHE_REQUESTS = Counter(
+    "service_cache_requests",
+    "Lookups of the cache of the service methods decorated with a CacheConfig",
+    ["class", "method", "result"],
+)
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    A hashable equivalent of an argument: containers become tuples and pydantic
+    models their dumped values.
+
+    Raises:
+        TypeError: If `value` holds an object that is not hashable.
+    """
+    if isinstance(value, BaseModel):
+        return (type(value), freeze(value.model_dump()))
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def default_key_builder(instance: Any, arguments: dict[str, Any]) -> Hashable:
+    """
+    Key of a call, from the `cache_scope` of the instance (e.g.
+    `BaseService.cache_scope`) and the bound arguments without `self`.
+    """
+    return (getattr(instance, "cache_scope", None), freeze(arguments))
+
+
+def default_instance_factory(instance: Any, session: Any) -> Any:
+    """An instance of the class of `instance` using `session`."""
+    return type(instance)(session)
+
+
+class CacheConfig(BaseModel):
+    enabled: bool = True
+    # Names of the cached methods, which must only read; none by default
+    methods: tuple[str, ...] = ()
+    # Seconds a result is served, and overrides by method name
+    ttl: float = Field(default=60, gt=0)
+    ttls: dict[str, float] = {}
+    # Results kept per method, the least recently used are evicted first
+    max_entries: int = Field(default=1024, gt=0)
+    # Builds the key of a call from the instance and its bound arguments,
+    # defaults applied and `self` excluded. Results are shared by the instances
+    # whose calls get the same key, so it must hold any instance state they
+    # depend on. Calls whose key cannot be built are not cached.
+    key_builder: Callable[[Any, dict[str, Any]], Hashable] = default_key_builder
+    # Opens the session of the call shared by concurrent misses, run on an
+    # instance built by `instance_factory`, so that it does not depend on the
+    # session of the caller that missed first. None runs it on that caller,
+    # for methods that do not use a session.
+    session_factory: Callable[[], AsyncContextManager[Any]] | None = None
+    instance_factory: Callable[[Any, Any], Any] = default_instance_factory
+    # Names of the methods clearing the cached results once they return or
+    # raise, e.g. the ones writing what the cached methods read
+    invalidated_by: tuple[str, ...] = ()
+    # Return a deep copy of cached results, so callers cannot alter them
+    copy_results: bool = True
+
+
+def cache(config: CacheConfig = CacheConfig()):
+    """
+    Caches the results of a coroutine method in the memory of the process.
+
+    Results are cached per method and key, for the `ttl` of the method, and
+    shared by the instances whose calls get the same key. Concurrent calls
+    missing the same key share a single call, on a session opened by
+    `session_factory` when set, and exceptions are not cached. Lookups are
+    counted in `service_cache_requests` by class, method and result (hit, miss
+    or bypass).
+
+    The decorated method gets a `cache_clear()` function dropping its results,
+    which `invalidates` calls after the methods listed in `invalidated_by`.
+    Calls in flight when it is called do not cache their result, and later
+    calls do not wait for them.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+        ttl = config.ttls.get(func.__name__, config.ttl)
+        entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        calls = SingleFlight()
+        # Bumped by `cache_clear`, so that loads started before are discarded
+        generation = 0
+        *owner, method = func.__qualname__.split(".")
+        counters = {
+            result: SERVICE_CACHE_REQUESTS.labels(
+                owner[-1] if owner else "", method, result
+            )
+            for result in ("hit", "miss", "bypass")
+        }
+
+        async def call(args: Any, kwargs: Any) -> Any:
+            if config.session_factory is None:
+                return await func(*args, **kwargs)
+            async with config.session_factory() as session:
+                instance = config.instance_factory(args[0], session)
+                return await func(instance, *args[1:], **kwargs)
+
+        async def load(key: Hashable, started: int, args: Any, kwargs: Any) -> Any:
+            result = await call(args, kwargs)
+            if started != generation:
+                return result
+            entries[key] = (time.monotonic() + ttl, result)
+            entries.move_to_end(key)
+            while len(entries) > config.max_entries:
+                entries.popitem(last=False)
+            return result
+
+        @wraps(func)
+        async def wrapped(*args: Any, **kwargs: Any) -> T:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            instance = arguments.pop(next(iter(signature.parameters)), None)
+            try:
+                key = config.key_builder(instance, arguments)
+                hash(key)
+            except TypeError:
+                counters["bypass"].inc()
+                return await func(*args, **kwargs)
+
+            entry = entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                entries.move_to_end(key)
+                counters["hit"].inc()
+                result = entry[1]
+            else:
+                entries.pop(key, None)
+                counters["miss"].inc()
+                started = generation
+                result = await calls.do(
+                    (started, key), lambda: load(key, started, args, kwargs)
+                )
+            return copy.deepcopy(result) if config.copy_results else result
+
+        def cache_clear() -> None:
+            nonlocal generation
+            generation += 1
+            entries.clear()
+
+        setattr(wrapped, "cache_clear", cache_clear)
+        return wrapped
+
+    return decorator
+
+
+def invalidates(*cached: Callable[..., Any]):
+    """
+    Clears the results of the `cached` methods once the decorated coroutine
+    returns or raises, since it may have written some of them before failing.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapped(*args: Any, **kwargs: Any) -> T:
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                for method in cached:
+                    getattr(method, "cache_clear")()
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.exc import NoResultFound
+
+from .exception_decorator import (
+    ExceptionsWrapperConfig,
+    not_found_error,
+    validation_error,
+)
+from .logger_decorator import LogWrapperConfig, call_sampler, truncate
+from .retry_decorator import RetryConfig, retry_delay
+from .timeit_decorator import TimeItConfig, duration_histogram, method_labels
+from .utils.format_func_and_args_name import format_func_and_args_name
+
+T = TypeVar("T")
+
+
+def compile_decorators(
+    func: Callable[..., Awaitable[T]],
+    retry_config: RetryConfig,
+    time_it_config: TimeItConfig,
+    log_wrapper_config: LogWrapperConfig,
+    exceptions_wrapper_config: ExceptionsWrapperConfig,
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wraps `func` in a single coroutine that behaves like the enabled decorators
+    nested as `retry(timeit(log_wrapper(exceptions_wrapper(func))))`.
+
+    The configs are read once, when the wrapper is built, and the behaviors run
+    inline in one frame instead of one per decorator. The name and arguments of
+    the call are formatted lazily, only when a log line is actually emitted.
+
+    Args:
+        func (Callable): The coroutine function to wrap.
+        retry_config (RetryConfig): Config of the `retry` behavior.
+        time_it_config (TimeItConfig): Config of the `timeit` behavior.
+        log_wrapper_config (LogWrapperConfig): Config of the `log_wrapper` behavior.
+        exceptions_wrapper_config (ExceptionsWrapperConfig): Config of the
+            `exceptions_wrapper` behavior.
+
+    Returns:
+        Callable: The wrapper, or `func` itself when no behavior is enabled.
+    """
+    map_exceptions = exceptions_wrapper_config.enabled
+    log_calls = log_wrapper_config.enabled
+    time_calls = time_it_config.enabled
+    retry_calls = retry_config.enabled
+    if not (map_exceptions or log_calls or time_calls or retry_calls):
+        return func
+
+    logger_ = logger.opt(lazy=True, depth=1)
+    # Bound to build the detail of a `NotFoundError`
+    signature = inspect.signature(func)
+
+    should_log = call_sampler(log_wrapper_config)
+    log_level = log_wrapper_config.log_level
+    log_entry = log_calls and log_wrapper_config.log_entry
+    log_exit = log_calls and log_wrapper_config.log_exit
+    log_error = log_calls and log_wrapper_config.log_error
+    max_result_length = log_wrapper_config.max_result_length
+
+    histogram = (
+        duration_histogram(time_it_config, func).labels(**method_labels(func))
+        if time_calls and time_it_config.record_metrics
+        else None
+    )
+    log_exec_time = time_calls and time_it_config.log_exec_time
+    time_level = time_it_config.log_level
+
+    max_attempts = retry_config.max_attempts if retry_calls else 1
+    log_retries = retry_calls and retry_config.log_retries
+    retry_level = retry_config.log_level
+
+    def func_name(args: tuple[Any, ...]) -> str:
+        return format_func_and_args_name(func, args)[0]
+
+    def args_repr(args: tuple[Any, ...]) -> Any:
+        return format_func_and_args_name(func, args)[1]
+
+    @wraps(func)
+    async def wrapped(*args: Any, **kwargs: Any) -> T:
+        started_at = time.monotonic()
+        for attempt in range(1, max_attempts + 1):
+            try:
+                if log_retries:
+                    logger_.log(
+                        retry_level,
+                        "[+] Executing function {}, attempt={}",
+                        lambda: func_name(args),
+                        lambda: attempt,
+                    )
+                start = time.perf_counter()
+                try:
+                    log_call = log_calls and (should_log is None or should_log())
+                    if log_entry and log_call:
+                        logger_.log(
+                            log_level,
+                            "[+] Entering '{}' (args={}, kwargs={})",
+                            lambda: func_name(args),
+                            lambda: args_repr(args),
+                            lambda: kwargs,
+                        )
+                    try:
+                        try:
+                            result = await func(*args, **kwargs)
+                        except NoResultFound as exc:
+                            if not map_exceptions:
+                                raise
+                            raise not_found_error(
+                                signature, func, args, kwargs
+                            ) from exc
+                        except ValidationError as exc:
+                            if not map_exceptions:
+                                raise
+                            raise validation_error(exc) from exc
+                        if log_exit and log_call:
+                            logger_.log(
+                                log_level,
+                                "[+] Exiting '{}' (result={})",
+                                lambda: func_name(args),
+                                lambda: truncate(result, max_result_length),
+                            )
+                    except Exception as e:
+                        if not log_calls:
+                            raise
+                        if log_error and log_call:
+                            logger_.log(
+                                log_level,
+                                "[x] Exception in '{}': {}",
+                                lambda: func_name(args),
+                                lambda error=e: error,
+                            )
+                        raise Exception from e
+                finally:
+                    if histogram is not None:
+                        histogram.observe(time.perf_counter() - start)
+                if log_exec_time:
+                    elapsed = time.perf_counter() - start
+                    logger_.log(
+                        time_level,
+                        "[+] Function '{}' executed in {:f} s",
+                        lambda: func_name(args),
+                        lambda: elapsed,
+                    )
+                return result
+            except Exception as exc:
+                if not retry_calls:
+                    raise
+                if log_retries:
+                    logger_.log(
+                        retry_level,
+                        "[*] Execution of function {} failed on attempt {}/{}",
+                        lambda: func_name(args),
+                        lambda: attempt,
+                        lambda: max_attempts,
+                    )
+                pause = await retry_delay(retry_config, exc, attempt, started_at, args)
+                if pause is None:
+                    if log_retries:
+                        logger_.log(
+                            retry_level,
+                            "[x] All retries of function {} failed.",
+                            lambda: func_name(args),
+                        )
+                    raise
+                if log_retries:
+                    logger_.log(
+                        retry_level,
+                        "[*] Retrying function {} after {}s",
+                        lambda: func_name(args),
+                        lambda: pause,
+                    )
+                await asyncio.sleep(pause)
+
+        raise RuntimeError(
+            f"All retries failed for {func_name(args)}; last exception handled"
+        )
+
+    return wrapped
@@ -1,7 +1,9 @@
-from .exception_decorator import exceptions_wrapper, ExceptionsWrapperConfig
-from .logger_decorator import log_wrapper, LogWrapperConfig
-from .retry_decorator import retry, RetryConfig
-from .timeit_decorator import timeit, TimeItConfig
+from .cache_decorator import cache, CacheConfig
+from .compiled_decorator import compile_decorators
+from .exception_decorator import ExceptionsWrapperConfig
+from .logger_decorator import LogWrapperConfig
+from .retry_decorator import RetryConfig
+from .timeit_decorator import TimeItConfig
 
 
 from typing import Callable, Awaitable, TypeVar
@@ -14,18 +16,31 @@ def composite_decorator(
     time_it_config: TimeItConfig,
     log_wrapper_config: LogWrapperConfig,
     exceptions_wrapper_config: ExceptionsWrapperConfig,
+    cache_config: CacheConfig | None = None,
 ):
+    """
+    Decorator applying the enabled `exceptions_wrapper`, `log_wrapper`, `timeit`
+    and `retry` behaviors, innermost first, compiled into a single wrapper by
+    `compile_decorators`. The methods listed by `cache_config` are then wrapped
+    by `cache`, so that hits skip every other behavior.
+    """
+
     def apply_decorators(
         func: Callable[..., Awaitable[T]],
     ) -> Callable[..., Awaitable[T]]:
-        if exceptions_wrapper_config.enabled:
-            func = exceptions_wrapper(exceptions_wrapper_config)(func)
-        if log_wrapper_config.enabled:
-            func = log_wrapper(log_wrapper_config)(func)
-        if time_it_config.enabled:
-            func = timeit(time_it_config)(func)
-        if retry_config.enabled:
-            func = retry(retry_config)(func)
+        func = compile_decorators(
+            func,
+            retry_config,
+            time_it_config,
+            log_wrapper_config,
+            exceptions_wrapper_config,
+        )
+        if (
+            cache_config is not None
+            and cache_config.enabled
+            and func.__name__ in cache_config.methods
+        ):
+            func = cache(cache_config)(func)
         return func
 
     return apply_decorators
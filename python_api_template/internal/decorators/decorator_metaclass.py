@@ -1,3 +1,6 @@
+import inspect
+
+from .cache_decorator import CacheConfig, invalidates
 from .exception_decorator import ExceptionsWrapperConfig
 from .logger_decorator import LogWrapperConfig
 from .retry_decorator import RetryConfig
@@ -28,12 +31,27 @@ class DecoratorMetaclass(type):
             "exceptions_wrapper_config",
             ExceptionsWrapperConfig(enabled=False, log_exceptions=False),
         )
+        cache_config = local.get("cache_config", CacheConfig(enabled=False))
 
         decorator = composite_decorator(
-            retry_config, time_it_config, log_wrapper_config, exceptions_wrapper_config
+            retry_config,
+            time_it_config,
+            log_wrapper_config,
+            exceptions_wrapper_config,
+            cache_config,
         )
 
         for key, value in list(local.items()):
-            if callable(value) and not key.startswith("__"):
+            # Only coroutine functions are wrapped, the compiled wrapper awaits
+            if inspect.iscoroutinefunction(value) and not key.startswith("__"):
                 local[key] = decorator(value)
-        return type.__new__(cls, name, bases, local)
+        new_class = type.__new__(cls, name, bases, local)
+
+        # Inherited methods included, once the class resolves them
+        if cache_config.enabled and cache_config.invalidated_by:
+            methods = [getattr(new_class, key) for key in cache_config.methods]
+            cached = [method for method in methods if hasattr(method, "cache_clear")]
+            for key in cache_config.invalidated_by:
+                method = invalidates(*cached)(getattr(new_class, key))
+                setattr(new_class, key, method)
+        return new_class
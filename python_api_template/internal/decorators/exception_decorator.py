@@ -1,10 +1,11 @@
+import inspect
 from typing import Any, Awaitable, Callable, TypeVar
 from functools import wraps
-from loguru import logger
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.exc import NoResultFound
 from fastapi import status
 
+from python_api_template.common.exceptions.base_exception import LazyDetail
 from python_api_template.common.exceptions.exceptions import (
     NotFoundError,
     PydanticError,
@@ -12,7 +13,7 @@ from python_api_template.common.exceptions.exceptions import (
 from python_api_template.common.schemas.validation_problem_details_v1 import (
     ValidationProblemDetailsV1,
 )
-from .utils.bind_arguments import bind_arguments
+from .utils.bind_arguments import bind_signature
 from .utils.format_validation_errors import format_validation_errors
 
 
@@ -24,8 +25,38 @@ class ExceptionsWrapperConfig(BaseModel):
     log_exceptions: bool = True
 
 
+def validation_error(exc: ValidationError) -> PydanticError:
+    """The `PydanticError` raised by a decorated method for a `ValidationError`."""
+    return PydanticError(
+        detail=ValidationProblemDetailsV1(
+            title="Validation Error",
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Invalid query parameters combination",
+            validation_errors=format_validation_errors(exc.errors()),
+        )
+    )
+
+
+def not_found_error(
+    signature: inspect.Signature,
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> NotFoundError:
+    """
+    The `NotFoundError` raised by a decorated method for a `NoResultFound`. Its
+    detail, the bound arguments of the call, is only built if it is read, e.g.
+    when the exception handler renders the response.
+    """
+    return NotFoundError(
+        detail=LazyDetail(lambda: bind_signature(signature, func, args, kwargs))
+    )
+
+
 def exceptions_wrapper(config: ExceptionsWrapperConfig = ExceptionsWrapperConfig()):
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+
         @wraps(func)
         async def wrapped_func(*args: Any, **kwargs: Any) -> T:
             """
@@ -42,20 +73,9 @@ def exceptions_wrapper(config: ExceptionsWrapperConfig = ExceptionsWrapperConfig
             try:
                 return await func(*args, **kwargs)
             except NoResultFound as exc:
-                kwargs_dict = await bind_arguments(func, *args, **kwargs)
-                logger.debug(kwargs_dict)
-                raise NotFoundError(detail=kwargs_dict) from exc
+                raise not_found_error(signature, func, args, kwargs) from exc
             except ValidationError as exc:
-                formatted_errors = format_validation_errors(exc.errors())
-                validation_details = ValidationProblemDetailsV1(
-                    title="Validation Error",
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Invalid query parameters combination",
-                    validation_errors=formatted_errors,
-                )
-                raise PydanticError(
-                    detail=validation_details,
-                ) from exc
+                raise validation_error(exc) from exc
 
         return wrapped_func
 
@@ -1,10 +1,12 @@
+import random
 from typing import Any, Callable, TypeVar, Awaitable
 from functools import wraps
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .utils.format_func_and_args_name import format_func_and_args_name
+from .utils.token_bucket import TokenBucket
 
 T = TypeVar("T")
 
@@ -15,15 +17,56 @@ class LogWrapperConfig(BaseModel):
     log_exit: bool = True
     log_error: bool = True
     log_level: str = "DEBUG"
+    # Log 1 in `sample_rate` calls, picked at random. The entry, exit and error
+    # lines of a call are either all logged or all skipped.
+    sample_rate: int = Field(default=1, ge=1)
+    # Calls logged per second by each method, in bursts of up to
+    # `rate_limit_burst`; None logs every sampled call
+    rate_limit: float | None = Field(default=None, gt=0)
+    rate_limit_burst: int = Field(default=10, ge=1)
+    # Characters of the result kept in the exit line; None keeps it whole
+    max_result_length: int | None = Field(default=None, ge=0)
+
+
+def call_sampler(config: LogWrapperConfig) -> Callable[[], bool] | None:
+    """
+    Returns the function deciding whether a call of a method is logged, or None
+    when every call is. Each method gets its own rate limit.
+    """
+    if config.sample_rate == 1 and config.rate_limit is None:
+        return None
+    bucket = (
+        TokenBucket(config.rate_limit, config.rate_limit_burst)
+        if config.rate_limit is not None
+        else None
+    )
+
+    def should_log() -> bool:
+        if config.sample_rate > 1 and random.random() * config.sample_rate >= 1:
+            return False
+        return bucket is None or bucket.try_acquire()
+
+    return should_log
+
+
+def truncate(value: Any, max_length: int | None) -> str:
+    """`str(value)`, cut to `max_length` characters."""
+    text = str(value)
+    if max_length is None or len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... ({len(text)} characters)"
 
 
 def log_wrapper(config: LogWrapperConfig = LogWrapperConfig()):
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        should_log = call_sampler(config)
+
         @wraps(func)
         async def wrapped(*args: Any, **kwargs: Any) -> T:
+            log_call = should_log is None or should_log()
             logger_ = logger.opt(depth=1)
             func_name, args_repr = format_func_and_args_name(func, args)
-            if config.log_entry:
+            if log_call and config.log_entry:
                 logger_.log(
                     config.log_level,
                     "[+] Entering '{}' (args={}, kwargs={})",
@@ -33,16 +76,16 @@ def log_wrapper(config: LogWrapperConfig = LogWrapperConfig()):
                 )
             try:
                 result = await func(*args, **kwargs)
-                if config.log_exit:
+                if log_call and config.log_exit:
                     logger_.log(
                         config.log_level,
                         "[+] Exiting '{}' (result={})",
                         func_name,
-                        result,
+                        truncate(result, config.max_result_length),
                     )
                 return result
             except Exception as e:
-                if config.log_error:
+                if log_call and config.log_error:
                     logger_.log(
                         config.log_level, "[x] Exception in '{}': {}", func_name, e
                     )
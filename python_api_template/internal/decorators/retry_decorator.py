@@ -1,29 +1,140 @@
 import asyncio
-from typing import Any, Awaitable, Callable, TypeVar
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
 from functools import wraps
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import DBAPIError, IntegrityError, NoResultFound
 
+from python_api_template.common.exceptions.exceptions import APIError
 from .utils.format_func_and_args_name import format_func_and_args_name
 
 T = TypeVar("T")
 
+# SQLSTATEs of errors that may not happen again on a new attempt: serialization
+# failure, deadlock, connection failures and server shutdown
+TRANSIENT_SQLSTATES = {"40001", "40P01", "08000", "08003", "08006", "57P01"}
+
 
 class RetryConfig(BaseModel):
     enabled: bool = True
     max_attempts: int = 3
+    # Delay before the first retry, doubled (see `backoff`) on each retry
     delay: float = 1.0
+    backoff: float = Field(default=2.0, ge=1)
+    max_delay: float = Field(default=30.0, ge=0)
+    # Waits a random delay between 0 and the computed one
+    jitter: bool = True
+    # Seconds after which no retry is started; None retries until max_attempts
+    deadline: float | None = Field(default=None, gt=0)
+    # Errors retried, unless they are, or were caused by, a `no_retry_on` error
+    retry_on: tuple[type[Exception], ...] = (Exception,)
+    no_retry_on: tuple[type[Exception], ...] = (
+        NoResultFound,
+        IntegrityError,
+        ValidationError,
+        APIError,
+    )
     log_retries: bool = False
     log_level: str = "DEBUG"
 
 
+def exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    """`exc` followed by the exceptions that caused it, e.g. `raise ... from`."""
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def is_transient_db_error(exc: BaseException) -> bool:
+    """
+    Tells whether `exc` is, or was caused by, a database error that a new
+    transaction may not hit: a serialization failure, a deadlock or a lost
+    connection.
+    """
+    for error in exception_chain(exc):
+        if isinstance(error, DBAPIError) and error.connection_invalidated:
+            return True
+        if isinstance(error, ConnectionResetError):
+            return True
+        if getattr(error, "sqlstate", None) in TRANSIENT_SQLSTATES:
+            return True
+    return False
+
+
+def is_retryable(exc: BaseException, config: RetryConfig) -> bool:
+    """
+    Tells whether `exc` is worth retrying: transient database errors always are,
+    other errors when they match `retry_on` and nothing in their chain matches
+    `no_retry_on`.
+    """
+    if is_transient_db_error(exc):
+        return True
+    chain = list(exception_chain(exc))
+    if any(isinstance(error, config.no_retry_on) for error in chain):
+        return False
+    return isinstance(exc, config.retry_on)
+
+
+def backoff_delay(attempt: int, config: RetryConfig) -> float:
+    """
+    Exponential backoff: `delay * backoff ** (attempt - 1)` capped at
+    `max_delay`, or a random delay below it with `jitter`.
+    """
+    delay = min(config.max_delay, config.delay * config.backoff ** (attempt - 1))
+    return random.uniform(0, delay) if config.jitter else delay
+
+
+async def retry_delay(
+    config: RetryConfig,
+    exc: Exception,
+    attempt: int,
+    started_at: float,
+    args: tuple[Any, ...],
+) -> float | None:
+    """
+    Prepares the retry of a call that failed with `exc`.
+
+    Transient database errors are rolled back first, through the `rollback`
+    method of the decorated instance (e.g. `BaseService.rollback`), so that the
+    retry runs in a new transaction on a healthy connection.
+
+    Args:
+        config (RetryConfig): The retry config of the call.
+        exc (Exception): The error of the attempt.
+        attempt (int): Number of the failed attempt, from 1.
+        started_at (float): `time.monotonic()` when the call started.
+        args (tuple): Positional arguments of the call, the instance first.
+
+    Returns:
+        float | None: Seconds to wait before retrying, or None to raise `exc`.
+    """
+    if attempt >= config.max_attempts or not is_retryable(exc, config):
+        return None
+    delay = backoff_delay(attempt, config)
+    if (
+        config.deadline is not None
+        and time.monotonic() + delay - started_at > config.deadline
+    ):
+        return None
+    rollback = getattr(args[0], "rollback", None) if args else None
+    if callable(rollback) and is_transient_db_error(exc):
+        await rollback()
+    return delay
+
+
 def retry(config: RetryConfig = RetryConfig()):
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
         @wraps(wrapped=func)
         async def wrapped(*args: Any, **kwargs: Any) -> T:
             logger_ = logger.opt(depth=1)
             func_name, _ = format_func_and_args_name(func, args)
+            started_at = time.monotonic()
             attempt = 1
             while attempt <= config.max_attempts:
                 try:
@@ -44,15 +155,16 @@ def retry(config: RetryConfig = RetryConfig()):
                             attempt,
                             config.max_attempts,
                         )
-                    if attempt < config.max_attempts:
+                    delay = await retry_delay(config, e, attempt, started_at, args)
+                    if delay is not None:
                         if config.log_retries:
                             logger_.log(
                                 config.log_level,
                                 "[*] Retrying function {} after {}s",
                                 func_name,
-                                config.delay,
+                                delay,
                             )
-                        await asyncio.sleep(config.delay)
+                        await asyncio.sleep(delay)
                         attempt += 1
                     else:
                         if config.log_retries:
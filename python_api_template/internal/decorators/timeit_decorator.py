@@ -3,12 +3,21 @@ from typing import Any, Callable, Awaitable, TypeVar
 from functools import wraps
 
 from loguru import logger
+from prometheus_client import REGISTRY, Histogram
 from pydantic import BaseModel
 
 from .utils.format_func_and_args_name import format_func_and_args_name
 
 T = TypeVar("T")
 
+# Histograms of the decorated methods, with their buckets and the qualified
+# name of the method that registered them, by metric name
+_histograms: dict[str, tuple[Histogram, tuple[float, ...], str]] = {}
+
+
+class MetricConfigurationError(ValueError):
+    """Raised when a metric is configured in two incompatible ways."""
+
 
 class TimeItConfig(BaseModel):
     enabled: bool = True
@@ -16,16 +25,75 @@ class TimeItConfig(BaseModel):
     delay: float = 1.0
     log_exec_time: bool = False
     log_level: str = "DEBUG"
+    # Record durations in a histogram labelled by class and method, exposed on
+    # /metrics next to the HTTP metrics of the Instrumentator
+    record_metrics: bool = False
+    metric_name: str = "service_method_duration_seconds"
+    # Upper bounds of the histogram buckets, in seconds
+    buckets: tuple[float, ...] = Histogram.DEFAULT_BUCKETS
+
+
+def duration_histogram(config: TimeItConfig, func: Callable[..., Any]) -> Histogram:
+    """
+    Returns the histogram named `config.metric_name` recording the durations of
+    `func`, registering it in the default registry, which the Instrumentator
+    exposes, on first use.
+
+    A Prometheus registry holds a single histogram per name, so every method
+    timed under the same `metric_name` must use the same `buckets`.
+
+    Raises:
+        MetricConfigurationError: If the histogram was registered with other
+            buckets, naming the method that registered it.
+    """
+    if config.metric_name not in _histograms:
+        histogram = Histogram(
+            config.metric_name,
+            "Duration of the decorated service methods, in seconds",
+            ["class", "method"],
+            buckets=config.buckets,
+            registry=REGISTRY,
+        )
+        _histograms[config.metric_name] = (
+            histogram,
+            config.buckets,
+            func.__qualname__,
+        )
+    histogram, buckets, registered_by = _histograms[config.metric_name]
+    if buckets != config.buckets:
+        raise MetricConfigurationError(
+            f"TimeItConfig of {func.__qualname__} records metric_name="
+            f"{config.metric_name!r} with buckets={config.buckets}, but "
+            f"{registered_by} registered it with buckets={buckets}. Use the same "
+            "buckets or another metric_name."
+        )
+    return histogram
+
+
+def method_labels(func: Callable[..., Any]) -> dict[str, str]:
+    """The `class` and `method` labels of the duration of `func`."""
+    *owner, method = func.__qualname__.split(".")
+    return {"class": owner[-1] if owner else "", "method": method}
 
 
 def timeit(config: TimeItConfig = TimeItConfig()):
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        histogram = (
+            duration_histogram(config, func).labels(**method_labels(func))
+            if config.record_metrics
+            else None
+        )
+
         @wraps(func)
         async def wrapped(*args: Any, **kwargs: Any) -> T:
             func_name, _ = format_func_and_args_name(func, args)
             start = time.perf_counter()
-            result = await func(*args, **kwargs)
-            end = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                if histogram is not None:
+                    histogram.observe(end - start)
             if config.log_exec_time:
                 logger_ = logger.opt(depth=1)
                 logger_.log(
@@ -1,4 +1,5 @@
 import inspect
+from functools import lru_cache
 from typing import Callable, Awaitable, Any, TypeVar
 
 from python_api_template.common.exceptions.exceptions import InternalServerError
@@ -7,6 +8,34 @@ from .format_func_and_args_name import format_func_and_args_name
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=None)
+def cached_signature(func: Callable[..., Any]) -> inspect.Signature:
+    """`inspect.signature(func)`, computed once per function."""
+    return inspect.signature(func)
+
+
+def bind_signature(
+    signature: inspect.Signature,
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Like `bind_arguments`, with the signature of `func` already computed, e.g.
+    when the method was decorated.
+    """
+    func_name, args_repr = format_func_and_args_name(func, args)
+    try:
+        bound_args = signature.bind(*args_repr, **kwargs)
+        bound_args.apply_defaults()
+    except TypeError as exc:
+        error_message = (
+            f"Error in binding arguments to function '{func_name}': {str(exc)}"
+        )
+        raise InternalServerError(detail=error_message)
+    return bound_args.arguments
+
+
 async def bind_arguments(
     func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
 ) -> dict[str, Any]:
@@ -28,27 +57,9 @@ async def bind_arguments(
         dict[str, Any]: A dictionary of the bound arguments, including defaults.
     """
 
-    func_name, args_repr = format_func_and_args_name(func, args)
-    try:
-        # Get the signature of the function.
-        signature = inspect.signature(func)
-
-        # Bind the provided arguments to the parameters in the function signature.
-        # This will raise a TypeError if there are missing required arguments
-        # or an excess of positional arguments.
-        bound_args = signature.bind(*args_repr, **kwargs)
-
-        # Apply default values to any parameters that were not provided in the call.
-        bound_args.apply_defaults()
-
-    except TypeError as exc:
-        error_message = (
-            f"Error in binding arguments to function '{func_name}': {str(exc)}"
-        )
-        raise InternalServerError(detail=error_message)
-
-    # Return the full dictionary of arguments, including defaults applied.
-    return bound_args.arguments
+    # The signature is computed once per function, binding raises a TypeError if
+    # there are missing required arguments or an excess of positional arguments.
+    return bind_signature(cached_signature(func), func, args, kwargs)
 
 
 if __name__ == "__main__":
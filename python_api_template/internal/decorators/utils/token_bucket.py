@@ -0,0 +1,31 @@
+import time
+
+
+class TokenBucket:
+    """
+    Allows `rate` actions per second on average, and bursts of up to `capacity`
+    actions. The bucket starts full.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            bool: Whether the action may proceed.
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
@@ -0,0 +1,177 @@
+import json
+import time
+from collections import deque
+
+import httpx
+from loguru import logger
+from prometheus_client import Gauge
+from starlette import status
+
+from python_api_template.common.enums.base_enum import BaseEnum
+from python_api_template.common.exceptions.exceptions import PydanticError
+
+
+class CircuitState(BaseEnum):
+    """
+    State of a circuit breaker
+
+    - closed: Calls go through and their outcome is recorded
+    - open: Calls fail fast without reaching the upstream
+    - half_open: A few probe calls decide whether to close or open again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+CIRCUIT_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "http_circuit_breaker_state",
+    "State of the circuit breaker of an upstream host "
+    "(0 = closed, 1 = half-open, 2 = open)",
+    ["host"],
+)
+
+# Client error statuses telling that the upstream is struggling, not that the
+# request was wrong
+FAILURE_STATUSES = {
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+
+def is_failed_response(response: httpx.Response) -> bool:
+    """Tells whether `response` is a 5xx, a 408 or a 429."""
+    return response.is_server_error or response.status_code in FAILURE_STATUSES
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Tells whether `error` means that the upstream failed to answer properly: a
+    transport or protocol error, a failed response (see `is_failed_response`)
+    or a body that cannot be decoded. Other 4xx responses are caused by the
+    input of the caller, so they do not.
+    """
+    if isinstance(
+        error,
+        (httpx.RequestError, json.JSONDecodeError, UnicodeDecodeError, PydanticError),
+    ):
+        return True
+    cause = error.__cause__
+    return isinstance(cause, httpx.HTTPStatusError) and is_failed_response(
+        cause.response
+    )
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing or answering too slowly.
+
+    The outcome of the last `window_size` calls is recorded while closed; a call
+    is bad when it failed or took `slow_call_duration` seconds or more. Once at
+    least `minimum_calls` were recorded and the share of bad ones reaches
+    `failure_rate_threshold`, the breaker opens and calls fail fast. After
+    `open_duration` seconds it lets `half_open_calls` probes through: the breaker
+    closes if all of them are good, and opens again on the first bad one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float = 5.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._good_probes = 0
+        CIRCUIT_BREAKER_STATE.labels(host=name).set(
+            CIRCUIT_STATE_VALUES[CircuitState.CLOSED]
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.open_duration
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Tells whether a call may be sent, taking a probe slot when half-open.
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record(self, duration: float, failed: bool) -> None:
+        """
+        Records the outcome of a call let through by `allow_request`.
+
+        Args:
+            duration (float): Seconds the call took.
+            failed (bool): Whether the upstream failed to answer properly.
+        """
+        bad = failed or duration >= self.slow_call_duration
+        if self._state is CircuitState.HALF_OPEN:
+            if bad:
+                self._transition(CircuitState.OPEN)
+                return
+            self._good_probes += 1
+            if self._good_probes >= self.half_open_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+        if self._state is CircuitState.OPEN:
+            # A call sent before the breaker opened
+            return
+
+        self._outcomes.append(bad)
+        if (
+            len(self._outcomes) >= self.minimum_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """
+        Gives back the probe slot of a call that ended without an outcome, e.g.
+        because it was cancelled.
+        """
+        if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        self._outcomes.clear()
+        self._probes = 0
+        self._good_probes = 0
+        if state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        CIRCUIT_BREAKER_STATE.labels(host=self.name).set(CIRCUIT_STATE_VALUES[state])
+        logger.warning(f"[*] Circuit breaker of {self.name} is now {state.value}")
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
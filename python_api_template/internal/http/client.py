@@ -1,7 +1,10 @@
-from typing import Any
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Sequence
 from urllib.parse import urljoin
 
-from httpx import AsyncClient, HTTPStatusError, Response
+from httpx import AsyncClient, HTTPStatusError, RequestError, Response
 from httpx._types import RequestFiles
 from loguru import logger
 from starlette import status
@@ -18,16 +21,94 @@ from python_api_template.common.exceptions.exceptions import (
 )
 
 from ..config.settings import global_settings
-from .decorators import http_retry
+from .circuit_breaker import CircuitBreaker, circuit_breakers, is_failed_response
+from .decorators import (
+    http_cache,
+    http_circuit_breaker,
+    http_hedge,
+    http_retry,
+    http_singleflight,
+)
+from .fan_out import RequestResult, RequestSpec
+from .hedging import HedgingPolicy, hedging_policies
+from .pool import http_client_pool
+from .response_cache import (
+    CONDITIONAL_HEADERS,
+    CachedResponse,
+    ResponseCacheBackend,
+    response_cache_key,
+)
+from .retry_budget import RetryBudget, retry_budgets
+from .utils import decode_response
 
 
 class HttpClient:
-    def __init__(self, host: str):
+    def __init__(
+        self,
+        host: str,
+        coalesce: bool = False,
+        response_cache: ResponseCacheBackend | None = None,
+        hedge: bool = False,
+    ):
         self.host = host
+        # Whether concurrent identical GETs share a single call
+        self.coalesce = coalesce
+        # Whether slow GETs are sent a second time, see `HedgingPolicy`
+        self.hedge = hedge
+        # Where GET responses are cached according to their Cache-Control, e.g.
+        # the shared `response_cache`; None disables caching
+        self.response_cache = response_cache
         self.headers = global_settings.http.basic_headers
         self.timeout = global_settings.http.timeout
         self.max_attempts = global_settings.http.max_attempts
         self.time_sleep = global_settings.http.time_sleep
+        self.backoff_max = global_settings.http.backoff_max
+        self.retry_statuses = set(global_settings.http.retry_statuses)
+
+    @property
+    def client(self) -> AsyncClient:
+        """The pooled client shared by every `HttpClient` of the same origin."""
+        return http_client_pool.get(self.host)
+
+    @property
+    def retry_budget(self) -> RetryBudget:
+        """The retry budget shared by every `HttpClient` of the same host."""
+        if self.host not in retry_budgets:
+            retry_budgets[self.host] = RetryBudget(
+                ratio=global_settings.http.retry_budget_ratio,
+                min_retries=global_settings.http.retry_budget_min_retries,
+                window=global_settings.http.retry_budget_window,
+            )
+        return retry_budgets[self.host]
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """The circuit breaker shared by every `HttpClient` of the same host."""
+        if self.host not in circuit_breakers:
+            circuit_breakers[self.host] = CircuitBreaker(
+                self.host,
+                failure_rate_threshold=global_settings.http.circuit_failure_rate,
+                slow_call_duration=global_settings.http.circuit_slow_call_duration,
+                window_size=global_settings.http.circuit_window_size,
+                minimum_calls=global_settings.http.circuit_minimum_calls,
+                open_duration=global_settings.http.circuit_open_duration,
+                half_open_calls=global_settings.http.circuit_half_open_calls,
+            )
+        return circuit_breakers[self.host]
+
+    @property
+    def hedging_policy(self) -> HedgingPolicy:
+        """The hedging policy shared by every `HttpClient` of the same host."""
+        if self.host not in hedging_policies:
+            hedging_policies[self.host] = HedgingPolicy(
+                percentile=global_settings.http.hedge_percentile,
+                initial_delay=global_settings.http.hedge_initial_delay,
+                min_samples=global_settings.http.hedge_min_samples,
+                recompute_every=global_settings.http.hedge_recompute_every,
+                max_ratio=global_settings.http.hedge_max_ratio,
+                window=global_settings.http.hedge_window,
+            )
+        return hedging_policies[self.host]
 
     async def _get(
         self,
@@ -37,11 +118,47 @@ class HttpClient:
     ) -> Response:
         if headers:
             self.headers.update(headers)
-        async with AsyncClient() as client:
-            return await client.get(
+        if self.response_cache is None:
+            return await self.client.get(
                 url, headers=self.headers, params=params, timeout=self.timeout
             )
 
+        key = response_cache_key(url, params, self.headers)
+        cached = await self.response_cache.get(key)
+        response = await self.client.get(
+            url,
+            headers={**self.headers, **(cached.validators if cached else {})},
+            params=params,
+            timeout=self.timeout,
+        )
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            cached = cached.revalidated(response) if cached else None
+            if cached is not None:
+                await self.response_cache.set(key, cached)
+                return cached.to_response(response.request)
+            # No entry to answer from, e.g. it can no longer be stored: ask for
+            # the whole body again
+            await self.response_cache.delete(key)
+            response = await self.client.get(
+                url,
+                headers={
+                    name: value
+                    for name, value in self.headers.items()
+                    if name.lower() not in CONDITIONAL_HEADERS
+                },
+                params=params,
+                timeout=self.timeout,
+            )
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        cached = CachedResponse.from_response(response)
+        if cached is None:
+            await self.response_cache.delete(key)
+        else:
+            await self.response_cache.set(key, cached)
+        return response
+
     async def _post(
         self,
         url: str,
@@ -52,23 +169,22 @@ class HttpClient:
     ) -> Response:
         if headers:
             headers.update(self.headers)
-        async with AsyncClient() as client:
-            if auth:
-                return await client.post(
-                    url,
-                    headers=headers,
-                    auth=auth,
-                    data=data,
-                    files=files,
-                    timeout=self.timeout,
-                )
-            return await client.post(
+        if auth:
+            return await self.client.post(
                 url,
                 headers=headers,
+                auth=auth,
                 data=data,
                 files=files,
                 timeout=self.timeout,
             )
+        return await self.client.post(
+            url,
+            headers=headers,
+            data=data,
+            files=files,
+            timeout=self.timeout,
+        )
 
     async def _put(
         self,
@@ -80,25 +196,28 @@ class HttpClient:
     ) -> Response:
         if headers:
             headers.update(self.headers)
-        async with AsyncClient() as client:
-            if auth:
-                return await client.put(
-                    url,
-                    headers=headers,
-                    auth=auth,
-                    data=data,
-                    files=files,
-                    timeout=self.timeout,
-                )
-            return await client.put(
+        if auth:
+            return await self.client.put(
                 url,
                 headers=headers,
+                auth=auth,
                 data=data,
                 files=files,
                 timeout=self.timeout,
             )
+        return await self.client.put(
+            url,
+            headers=headers,
+            data=data,
+            files=files,
+            timeout=self.timeout,
+        )
 
+    @http_cache
+    @http_singleflight
     @http_retry
+    @http_hedge
+    @http_circuit_breaker
     async def request(
         self,
         path: str,
@@ -106,35 +225,147 @@ class HttpClient:
         data: dict[str, Any] | None = None,
         auth: tuple[str, str] | None = None,
         files: RequestFiles | None = None,
+        response_model: Any = None,
     ) -> Any:
+        """
+        Sends a request and returns its parsed JSON body.
+
+        Args:
+            path (str): Path of the request, relative to `host`.
+            method (RequestMethod): The HTTP method.
+            data (dict[str, Any], optional): Query parameters of a GET, form of a
+                POST or PUT.
+            auth (tuple[str, str], optional): Basic auth credentials.
+            files (RequestFiles, optional): Files of a multipart POST or PUT.
+            response_model (Any, optional): Type to validate the body into, e.g. a
+                pydantic model or `list[Model]`. Defaults to plain JSON values.
+
+        Returns:
+            Any: The body, as `response_model` if given.
+        """
         url = urljoin(self.host, path)
 
-        try:
-            if files and method == RequestMethod.GET:
-                raise MethodNotAllowedError(
-                    detail=f"Method {method} not allowed",
-                    url=url,
-                )
-            if method == RequestMethod.GET:
-                response = await self._get(url, params=data)
-            elif method == RequestMethod.POST:
-                response = await self._post(url, auth=auth, data=data, files=files)
-            elif method == RequestMethod.PUT:
-                response = await self._put(url, auth=auth, data=data, files=files)
-            else:
+        if files and method == RequestMethod.GET:
+            raise MethodNotAllowedError(
+                detail=f"Method {method} not allowed",
+                url=url,
+            )
+        if method == RequestMethod.GET:
+            response = await self._get(url, params=data)
+        elif method == RequestMethod.POST:
+            response = await self._post(url, auth=auth, data=data, files=files)
+        elif method == RequestMethod.PUT:
+            response = await self._put(url, auth=auth, data=data, files=files)
+        else:
+            raise MethodNotAllowedError(
+                detail=f"Method {method} not allowed",
+                url=url,
+            )
+
+        logger.info(
+            f"[+] request made. [url={url}] - [status_code={response.status_code}]"
+        )
+
+        self._raise_for_status(response, url)
+        return decode_response(response.content, response_model, url)
+
+    async def stream_request(
+        self,
+        path: str,
+        method: RequestMethod = RequestMethod.GET,
+        data: dict[str, Any] | None = None,
+        auth: tuple[str, str] | None = None,
+        content: AsyncIterable[bytes] | None = None,
+        headers: dict[str, Any] | None = None,
+        ndjson: bool = False,
+        chunk_size: int = 64 * 1024,
+    ) -> AsyncIterator[Any]:
+        """
+        Sends a request and iterates over the response body as it arrives, so
+        memory stays bounded by `chunk_size` (or one line) whatever the size of
+        the body.
+
+        The body of a POST or PUT can be streamed as well, from `content`, e.g.
+        `aiter_file(path)`. Streams are not retried nor cached, but go through
+        the circuit breaker of the host, which records the outcome once the
+        response headers arrive.
+
+        Args:
+            path (str): Path of the request, relative to `host`.
+            method (RequestMethod, optional): Defaults to GET.
+            data (dict[str, Any], optional): Query parameters of a GET, form of a
+                POST or PUT.
+            auth (tuple[str, str], optional): Basic auth credentials.
+            content (AsyncIterable[bytes], optional): Body to upload in chunks.
+            headers (dict[str, Any], optional): Extra headers of the request.
+            ndjson (bool, optional): Whether to yield the parsed lines of an NDJSON
+                body instead of raw chunks. Defaults to False.
+            chunk_size (int, optional): Size of the yielded chunks, in bytes.
+
+        Yields:
+            bytes | Any: The next chunk of the body, or the next parsed line.
+        """
+        url = urljoin(self.host, path)
+        if method == RequestMethod.GET:
+            if content is not None:
                 raise MethodNotAllowedError(
                     detail=f"Method {method} not allowed",
                     url=url,
                 )
+            params, form, headers = data, None, {**self.headers, **(headers or {})}
+        else:
+            params, form = None, data
 
-            logger.info(
-                f"[+] request made. [url={url}] - "
-                f"[status_code={response.status_code}]"
+        breaker = self.circuit_breaker
+        if not breaker.allow_request():
+            raise ServiceUnavailableError(
+                detail=f"Circuit breaker open for {self.host}", url=self.host
             )
+        recorded = False
+        start = time.perf_counter()
+        try:
+            async with self.client.stream(
+                method.value,
+                url,
+                params=params,
+                data=form,
+                content=content,
+                auth=auth,
+                headers=headers,
+                timeout=self.timeout,
+            ) as response:
+                breaker.record(
+                    time.perf_counter() - start, failed=is_failed_response(response)
+                )
+                recorded = True
+                logger.info(
+                    f"[+] stream opened. [url={url}] - "
+                    f"[status_code={response.status_code}]"
+                )
 
-            response.raise_for_status()
-            return response.json()
+                if response.is_error:
+                    await response.aread()
+                    self._raise_for_status(response, url)
+                if ndjson:
+                    async for line in response.aiter_lines():
+                        if line.strip():
+                            yield json.loads(line)
+                else:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        yield chunk
+        except RequestError:
+            if not recorded:
+                recorded = True
+                breaker.record(time.perf_counter() - start, failed=True)
+            raise
+        finally:
+            if not recorded:
+                breaker.release()
 
+    @staticmethod
+    def _raise_for_status(response: Response, url: str) -> None:
+        try:
+            response.raise_for_status()
         except HTTPStatusError as e:
             match e.response.status_code:
                 case status.HTTP_400_BAD_REQUEST:
@@ -151,3 +382,78 @@ class HttpClient:
                     raise ServiceUnavailableError(
                         detail=e.response.text, url=url
                     ) from e
+
+    async def request_many(
+        self,
+        requests: Sequence[RequestSpec],
+        max_concurrency: int = 10,
+        timeout: float | None = None,
+        fail_fast: bool = False,
+    ) -> list[RequestResult]:
+        """
+        Sends `requests` concurrently, at most `max_concurrency` at a time.
+
+        Each call goes through `request`, with its retries, circuit breaker and
+        caches, and its error is captured in its result instead of being raised.
+
+        Args:
+            requests (Sequence[RequestSpec]): The calls to make.
+            max_concurrency (int, optional): Calls in flight at once. Defaults to 10.
+            timeout (float, optional): Seconds after which the calls still running
+                or waiting are cancelled. Defaults to no deadline.
+            fail_fast (bool, optional): Whether to cancel the remaining calls as
+                soon as one fails. Defaults to False.
+
+        Returns:
+            list[RequestResult]: The outcome of every call, in the order of
+            `requests`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: list[RequestResult | None] = [None] * len(requests)
+
+        async def send(index: int, spec: RequestSpec) -> None:
+            async with semaphore:
+                try:
+                    result = await self.request(
+                        spec.path,
+                        spec.method,
+                        spec.data,
+                        spec.auth,
+                        spec.files,
+                        spec.response_model,
+                    )
+                except Exception as error:
+                    results[index] = RequestResult(error=error)
+                    if fail_fast:
+                        raise
+                else:
+                    results[index] = RequestResult(result=result)
+
+        tasks = [
+            asyncio.create_task(send(index, spec))
+            for index, spec in enumerate(requests)
+        ]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(
+            tasks,
+            timeout=timeout,
+            return_when=asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED,
+        )
+        failed = any(task.exception() is not None for task in done)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if pending:
+            logger.warning(
+                f"[*] {len(pending)} of {len(tasks)} requests cancelled. "
+                f"[reason={'failure' if failed else 'deadline'}]"
+            )
+        return [
+            result
+            or RequestResult(
+                error=asyncio.CancelledError() if failed else TimeoutError()
+            )
+            for result in results
+        ]
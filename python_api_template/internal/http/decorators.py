@@ -1,24 +1,100 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import json
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urljoin
 
 import httpx
 from loguru import logger
+from starlette import status
 
-from python_api_template.common.exceptions.exceptions import TooManyRequestsError
+from python_api_template.common.exceptions.enums import RequestMethod
+from python_api_template.common.exceptions.exceptions import (
+    APIError,
+    MethodNotAllowedError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+)
+
+from .circuit_breaker import is_upstream_failure
+from .hedging import HEDGED_REQUESTS
+from .response_cache import response_cache_key
+from .singleflight import singleflight
+from .utils import decode_response
 
 if TYPE_CHECKING:
+    from .circuit_breaker import CircuitBreaker
     from .client import HttpClient
+    from .hedging import HedgingPolicy
+    from .response_cache import ResponseCacheBackend
+    from .retry_budget import RetryBudget
+
+# Methods that can be sent twice without changing the result
+IDEMPOTENT_METHODS = {RequestMethod.GET, RequestMethod.PUT}
+# Statuses whose Retry-After header tells how long to wait
+RETRY_AFTER_STATUSES = {
+    status.HTTP_429_TOO_MANY_REQUESTS,
+    status.HTTP_503_SERVICE_UNAVAILABLE,
+}
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff with full jitter: a random delay between 0 and
+    `base * 2 ** (attempt - 1)`, capped at `maximum`, so the retries of many
+    clients spread out instead of hitting the upstream in lockstep.
+    """
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """
+    Seconds to wait according to the `Retry-After` header of `response`, given
+    either as a number of seconds or as an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
 def http_retry(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Retries `HttpClient.request` on transport errors, on 429 and, for idempotent
+    methods, on the statuses of `HttpClient.retry_statuses`.
+
+    Attempts are spaced with `backoff_delay`, unless a 429 or 503 carries a
+    `Retry-After`, which is honored as long as it is not longer than
+    `HttpClient.backoff_max`. Every retry is taken from the `RetryBudget` of the
+    host, and the error is raised as is once the budget is spent.
+    """
+    signature = inspect.signature(func)
+
     @wraps(func)
     async def wrapped_func(self: HttpClient, *args: Any, **kwargs: Any) -> Any:
         max_attempts: int = getattr(self, "max_attempts")
         time_sleep: float = getattr(self, "time_sleep")
+        backoff_max: float = getattr(self, "backoff_max")
+        retry_statuses: set[int] = getattr(self, "retry_statuses")
+        budget: RetryBudget = getattr(self, "retry_budget")
+        method = signature.bind(self, *args, **kwargs).arguments.get("method")
 
+        budget.record_request()
         for attempt in range(1, max_attempts + 1):
             try:
                 logger.info(f"[+] Sending request - [attempt={attempt}]")
@@ -29,11 +105,192 @@ def http_retry(func: Callable[..., Any]) -> Callable[..., Any]:
                     f"[*] Request failed on attempt {attempt}/{max_attempts}. Error: {error}"
                 )
 
-                if attempt < max_attempts:
-                    logger.info(f"[*] Retrying after {time_sleep}s.")
-                    await asyncio.sleep(time_sleep)
-                else:
+                if attempt == max_attempts or not budget.try_retry():
                     logger.error("[X] All retry attempts failed.")
                     raise TooManyRequestsError("") from error
+                delay = backoff_delay(attempt, time_sleep, backoff_max)
+            except APIError as error:
+                if not isinstance(error.__cause__, httpx.HTTPStatusError):
+                    raise
+                upstream = error.__cause__.response
+                retryable = (
+                    upstream.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+                    or (
+                        upstream.status_code in retry_statuses
+                        and method in IDEMPOTENT_METHODS
+                    )
+                )
+                if not retryable or attempt == max_attempts:
+                    raise
+                logger.warning(
+                    f"[*] Request failed on attempt {attempt}/{max_attempts}. "
+                    f"[status_code={upstream.status_code}]"
+                )
+
+                delay = None
+                if upstream.status_code in RETRY_AFTER_STATUSES:
+                    delay = retry_after(upstream)
+                if delay is None:
+                    delay = backoff_delay(attempt, time_sleep, backoff_max)
+                elif delay > backoff_max:
+                    logger.error(f"[X] Upstream asked to retry after {delay}s.")
+                    raise
+                if not budget.try_retry():
+                    logger.error("[X] Retry budget exhausted.")
+                    raise
+
+            logger.info(f"[*] Retrying after {delay:.2f}s.")
+            await asyncio.sleep(delay)
+
+    return wrapped_func
+
+
+def http_hedge(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Sends a GET of `HttpClient.request` a second time when it is still waiting
+    for its response after `HedgingPolicy.delay`, when the client was created
+    with `hedge=True`, and returns whichever attempt succeeds first.
+
+    The other attempt is cancelled. A hedge is only sent while the policy of the
+    host allows it; an attempt that fails while the other is still running is
+    ignored, and the error of the primary attempt is raised if both fail.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    async def wrapped_func(self: HttpClient, *args: Any, **kwargs: Any) -> Any:
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        if not getattr(self, "hedge") or arguments.get("method") != RequestMethod.GET:
+            return await func(self, *args, **kwargs)
+        policy: HedgingPolicy = getattr(self, "hedging_policy")
+
+        async def attempt() -> Any:
+            start = time.perf_counter()
+            response = await func(self, *args, **kwargs)
+            policy.record_latency(time.perf_counter() - start)
+            return response
+
+        policy.record_request()
+        primary = asyncio.ensure_future(attempt())
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=policy.delay)
+            if not done and policy.try_hedge():
+                logger.info(f"[*] Hedging request to {self.host}.")
+                attempts.append(asyncio.ensure_future(attempt()))
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if not task.exception()), None)
+                if winner is not None:
+                    if len(attempts) > 1:
+                        HEDGED_REQUESTS.labels(
+                            host=self.host,
+                            winner="primary" if winner is primary else "hedge",
+                        ).inc()
+                    return winner.result()
+            return primary.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    return wrapped_func
+
+
+def http_circuit_breaker(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Sends each attempt of `HttpClient.request` through the `CircuitBreaker` of
+    the host. While the breaker is open, `ServiceUnavailableError` is raised
+    without reaching the upstream, and `http_retry` does not retry it.
+
+    Transport and protocol errors, 5xx, 408 and 429 responses and bodies that
+    cannot be decoded count as failures (see `is_upstream_failure`). Other 4xx
+    responses mean that the upstream is answering. Calls rejected before being
+    sent, such as a GET with files, are not recorded.
+    """
+
+    @wraps(func)
+    async def wrapped_func(self: HttpClient, *args: Any, **kwargs: Any) -> Any:
+        breaker: CircuitBreaker = getattr(self, "circuit_breaker")
+        if not breaker.allow_request():
+            raise ServiceUnavailableError(
+                detail=f"Circuit breaker open for {self.host}", url=self.host
+            )
+
+        start = time.perf_counter()
+        try:
+            response: Any = await func(self, *args, **kwargs)
+        except MethodNotAllowedError:
+            breaker.release()
+            raise
+        except (httpx.RequestError, APIError, ValueError) as error:
+            failed = is_upstream_failure(error)
+            breaker.record(time.perf_counter() - start, failed=failed)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record(time.perf_counter() - start, failed=False)
+        return response
+
+    return wrapped_func
+
+
+def http_singleflight(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Makes concurrent identical GETs of `HttpClient.request` share one call, when
+    the client was created with `coalesce=True`.
+
+    GETs are identical when they have the same URL, query parameters and headers.
+    The shared call includes its retries, and every caller gets its parsed
+    result or the same exception.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    async def wrapped_func(self: HttpClient, *args: Any, **kwargs: Any) -> Any:
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        if (
+            not getattr(self, "coalesce")
+            or arguments.get("method") != RequestMethod.GET
+        ):
+            return await func(self, *args, **kwargs)
+
+        key = (
+            urljoin(self.host, arguments["path"]),
+            json.dumps(arguments.get("data"), sort_keys=True, default=str),
+            tuple(sorted(self.headers.items())),
+            arguments.get("response_model"),
+        )
+        return await singleflight.do(key, lambda: func(self, *args, **kwargs))
+
+    return wrapped_func
+
+
+def http_cache(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Answers GETs of `HttpClient.request` from `HttpClient.response_cache` while
+    the cached response is fresh, without reaching the upstream, the circuit
+    breaker or the retries. Stale responses are revalidated by `HttpClient._get`.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    async def wrapped_func(self: HttpClient, *args: Any, **kwargs: Any) -> Any:
+        cache: ResponseCacheBackend | None = getattr(self, "response_cache")
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        if cache is None or arguments.get("method") != RequestMethod.GET:
+            return await func(self, *args, **kwargs)
+
+        url = urljoin(self.host, arguments["path"])
+        cached = await cache.get(
+            response_cache_key(url, arguments.get("data"), self.headers)
+        )
+        if cached is not None and cached.is_fresh:
+            return decode_response(cached.content, arguments.get("response_model"), url)
+        return await func(self, *args, **kwargs)
 
     return wrapped_func
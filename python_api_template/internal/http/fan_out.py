@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any
+
+from httpx._types import RequestFiles
+
+from python_api_template.common.exceptions.enums import RequestMethod
+
+
+@dataclass
+class RequestSpec:
+    """Arguments of one `HttpClient.request` call of `HttpClient.request_many`."""
+
+    path: str
+    method: RequestMethod = RequestMethod.GET
+    data: dict[str, Any] | None = None
+    auth: tuple[str, str] | None = None
+    files: RequestFiles | None = None
+    response_model: Any = None
+
+
+@dataclass
+class RequestResult:
+    """
+    Outcome of one call of `HttpClient.request_many`: its parsed `result`, or the
+    `error` it raised. Calls that did not finish get a `TimeoutError` when the
+    deadline expired, or an `asyncio.CancelledError` when a fail-fast failure
+    cancelled them.
+    """
+
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
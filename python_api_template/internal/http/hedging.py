@@ -0,0 +1,86 @@
+import math
+import time
+from collections import deque
+
+from prometheus_client import Counter
+
+HEDGED_REQUESTS = Counter(
+    "http_hedged_requests",
+    "Hedges sent by HttpClient, by upstream host and by the attempt that won",
+    ["host", "winner"],
+)
+
+
+class HedgingPolicy:
+    """
+    Tells when a GET still waiting for its response is sent a second time.
+
+    The delay is the `percentile` of the latencies of the last `sample_size`
+    successful calls, or `initial_delay` until `min_samples` were observed, so
+    only the slowest calls are hedged. The percentile is sorted out of the
+    samples again only once `recompute_every` new latencies were observed. Over
+    a sliding `window` of seconds, hedges are capped to `max_ratio` times the
+    number of requests, which bounds the extra load put on the upstream.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        initial_delay: float = 0.5,
+        min_samples: int = 20,
+        sample_size: int = 1_000,
+        recompute_every: int = 50,
+        max_ratio: float = 0.05,
+        window: float = 10,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.recompute_every = recompute_every
+        self.max_ratio = max_ratio
+        self.window = window
+        self._latencies: deque[float] = deque(maxlen=sample_size)
+        self._requests: deque[float] = deque()
+        self._hedges: deque[float] = deque()
+        self._delay: float | None = None
+        self._new_latencies = 0
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait for a response before hedging."""
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        if self._delay is None or self._new_latencies >= self.recompute_every:
+            latencies = sorted(self._latencies)
+            index = math.ceil(self.percentile * len(latencies)) - 1
+            self._delay = latencies[min(max(index, 0), len(latencies) - 1)]
+            self._new_latencies = 0
+        return self._delay
+
+    def record_request(self) -> None:
+        """Records a request that may be hedged."""
+        self._requests.append(time.monotonic())
+
+    def record_latency(self, duration: float) -> None:
+        """Records the seconds a successful call took."""
+        self._latencies.append(duration)
+        self._new_latencies += 1
+
+    def try_hedge(self) -> bool:
+        """
+        Records a hedge if the cap allows it.
+
+        Returns:
+            bool: Whether the hedge may be sent.
+        """
+        now = time.monotonic()
+        for timestamps in (self._requests, self._hedges):
+            while timestamps and timestamps[0] <= now - self.window:
+                timestamps.popleft()
+        if len(self._hedges) >= self.max_ratio * len(self._requests):
+            return False
+        self._hedges.append(now)
+        return True
+
+
+hedging_policies: dict[str, HedgingPolicy] = {}
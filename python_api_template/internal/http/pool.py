@@ -0,0 +1,79 @@
+import httpx
+from httpx import AsyncClient
+
+
+class HttpClientPool:
+    """
+    Keeps one pooled `AsyncClient` per upstream origin (scheme, host and port).
+
+    Connections are reused across requests through keep-alive instead of paying
+    the TCP and TLS handshakes on every call. The pool is initialized and closed
+    in the application lifespan, like `DatabaseSessionManager`.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self._clients: dict[tuple[str, str, int | None], AsyncClient] = {}
+        self._limits: httpx.Limits | None = None
+        self._http2 = False
+        self._timeout = 30.0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpClientPool, cls).__new__(cls)
+            cls._instance._clients = {}
+            cls._instance._limits = None
+        return cls._instance
+
+    def init(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+        timeout: float = 30.0,
+    ):
+        """
+        Configures the clients created from now on.
+
+        Args:
+            max_connections (int, optional): Connections open at once per origin.
+            max_keepalive_connections (int, optional): Idle connections kept per
+                origin.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept.
+            http2 (bool, optional): Whether to negotiate HTTP/2 with the upstreams.
+            timeout (float, optional): Default timeout of the requests, in seconds.
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        self._timeout = timeout
+
+    async def close(self):
+        if self._limits is None:
+            raise Exception("HttpClientPool is not initialized")
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+        self._limits = None
+
+    def get(self, url: str) -> AsyncClient:
+        """
+        Returns the client of the origin of `url`, creating it on first use.
+        """
+        if self._limits is None:
+            raise IOError("HttpClientPool is not initialized")
+        parsed = httpx.URL(url)
+        origin = (parsed.scheme, parsed.host, parsed.port)
+        if origin not in self._clients:
+            self._clients[origin] = AsyncClient(
+                limits=self._limits, http2=self._http2, timeout=self._timeout
+            )
+        return self._clients[origin]
+
+
+http_client_pool = HttpClientPool()
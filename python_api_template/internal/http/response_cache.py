@@ -0,0 +1,172 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from ..config.settings import global_settings
+
+# Headers describing the raw transfer, which no longer apply to the decoded body
+HOP_BY_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# Headers making a GET conditional, answered with a bodiless 304 when they match
+CONDITIONAL_HEADERS = {"if-none-match", "if-modified-since"}
+
+
+def parse_cache_control(value: str) -> dict[str, str]:
+    """
+    Parses a `Cache-Control` header into its lowercase directives, e.g.
+    `"public, max-age=60"` into `{"public": "", "max-age": "60"}`.
+    """
+    directives = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def response_cache_key(
+    url: str, params: dict[str, Any] | None, headers: dict[str, Any]
+) -> str:
+    """Key of the cached response of a GET."""
+    return json.dumps(
+        [str(httpx.URL(url, params=params)), sorted(headers.items())], default=str
+    )
+
+
+@dataclass
+class CachedResponse:
+    """
+    Body and headers of a 200 response to a GET, fresh until `expires_at`
+    (a UNIX timestamp, so entries remain meaningful in a shared backend).
+    """
+
+    content: bytes
+    headers: dict[str, str]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Headers making a request conditional on the cached version."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers=self.headers, content=self.content, request=request
+        )
+
+    def revalidated(self, not_modified: httpx.Response) -> "CachedResponse | None":
+        """
+        The entry updated with the headers of a 304 response confirming it.
+        """
+        headers = {**self.headers, **self._headers(not_modified)}
+        return self.from_response(
+            httpx.Response(200, headers=headers, content=self.content)
+        )
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "CachedResponse | None":
+        """
+        Builds the entry of `response`, or returns None if it must not be cached.
+
+        The response is fresh for its `max-age` minus its `Age`. A response with
+        `no-cache`, or without `max-age` but with an `ETag` or `Last-Modified`,
+        is stored to be revalidated on every use. `no-store` and `Vary: *`
+        responses are not stored.
+        """
+        directives = parse_cache_control(response.headers.get("cache-control", ""))
+        if "no-store" in directives or response.headers.get("vary") == "*":
+            return None
+
+        try:
+            max_age = int(directives.get("max-age", 0))
+            max_age -= int(response.headers.get("age", 0))
+        except ValueError:
+            max_age = 0
+        if "no-cache" in directives:
+            max_age = 0
+
+        headers = cls._headers(response)
+        if max_age <= 0 and "etag" not in headers and "last-modified" not in headers:
+            return None
+        return cls(response.content, headers, time.time() + max(0, max_age))
+
+    @staticmethod
+    def _headers(response: httpx.Response) -> dict[str, str]:
+        return {
+            name: value
+            for name, value in response.headers.items()
+            if name not in HOP_BY_HOP_HEADERS
+        }
+
+
+class ResponseCacheBackend(ABC):
+    """Storage of the `CachedResponse` of `HttpClient` GETs, by key."""
+
+    @abstractmethod
+    async def get(self, key: str) -> CachedResponse | None:
+        """Returns the entry stored under `key`, fresh or not, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        """Stores `entry` under `key`."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Removes the entry stored under `key`, if any."""
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """
+    Response cache kept in the memory of the process, bounded by the size of its
+    entries. The least recently used entries are evicted first, and an entry
+    larger than the whole cache is not stored.
+    """
+
+    def __init__(self, max_bytes: int = 50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        await self.delete(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+response_cache = InMemoryResponseCache(global_settings.http.response_cache_max_bytes)
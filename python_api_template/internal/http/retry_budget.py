@@ -0,0 +1,45 @@
+import time
+from collections import deque
+
+
+class RetryBudget:
+    """
+    Caps the retries sent to an upstream to a fraction of its requests.
+
+    Over a sliding `window` of seconds, retries are allowed while they stay below
+    `ratio` times the number of requests, or below `min_retries` so that a host
+    with little traffic can still retry. Once the budget is spent, failures are
+    returned to the caller instead of adding load to a degraded upstream.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10, window: float = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def record_request(self) -> None:
+        """Records a first attempt."""
+        self._requests.append(time.monotonic())
+
+    def try_retry(self) -> bool:
+        """
+        Records a retry if the budget allows it.
+
+        Returns:
+            bool: Whether the retry may be sent.
+        """
+        now = time.monotonic()
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] <= now - self.window:
+                timestamps.popleft()
+        if len(self._retries) >= max(
+            self.min_retries, self.ratio * len(self._requests)
+        ):
+            return False
+        self._retries.append(now)
+        return True
+
+
+retry_budgets: dict[str, RetryBudget] = {}
@@ -0,0 +1,4 @@
+from python_api_template.internal.utils.singleflight import SingleFlight
+
+# Coalesces the concurrent GET requests sent by the HTTP clients of the worker
+singleflight = SingleFlight()
@@ -1,5 +1,11 @@
+import json
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
 from pydantic_core import ErrorDetails
 
+from python_api_template.common.exceptions.exceptions import PydanticError
 from python_api_template.common.schemas.error import Error
 
 
@@ -11,3 +17,29 @@ def format_validation_errors(errors: list[ErrorDetails]) -> list[Error]:
         message = error.get("msg", None)
         formatted_errors.append(Error(parameter=field, message=message, type=None))
     return formatted_errors
+
+
+@lru_cache
+def type_adapter(response_model: Any) -> TypeAdapter[Any]:
+    """The `TypeAdapter` of `response_model`, built once as building it is costly."""
+    return TypeAdapter(response_model)
+
+
+def decode_response(content: bytes, response_model: Any = None, url: str = "") -> Any:
+    """
+    Parses a JSON body, straight into `response_model` when given.
+
+    With a model, the raw bytes are validated by pydantic-core in a single pass,
+    instead of building dicts with `json.loads` and validating them afterwards.
+
+    Raises:
+        PydanticError: If the body does not match `response_model`.
+    """
+    if response_model is None:
+        return json.loads(content)
+    try:
+        return type_adapter(response_model).validate_json(content)
+    except ValidationError as exc:
+        raise PydanticError(
+            detail=format_validation_errors(exc.errors()), url=url
+        ) from exc
@@ -1,7 +1,22 @@
+import asyncio
 from pathlib import Path
+from typing import AsyncIterator
 
 
 def read_file(file_path: Path | str) -> str:
     path = Path(file_path)
     with path.open("r") as file:
         return file.read()
+
+
+async def aiter_file(
+    file_path: Path | str, chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Reads a file in chunks of `chunk_size` bytes without blocking the event loop,
+    e.g. to stream it as the body of an upload.
+    """
+    path = Path(file_path)
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
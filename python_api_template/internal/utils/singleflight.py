@@ -0,0 +1,40 @@
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing the same key into a single call.
+
+    The first caller of a key starts the call; the ones arriving while it is in
+    flight wait for it instead of starting their own, and all of them get its
+    result or its exception. Waiters get a deep copy of the result, so none of
+    them can alter what the others see. A cancelled waiter does not cancel the
+    shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `func()`, or the call already in flight for `key`.
+
+        Args:
+            key (Hashable): Identifies calls that are interchangeable.
+            func (Callable[[], Awaitable[Any]]): Starts the call.
+
+        Returns:
+            Any: The result of the call.
+        """
+        if key in self._calls:
+            return copy.deepcopy(await asyncio.shield(self._calls[key]))
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
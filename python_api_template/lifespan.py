@@ -4,6 +4,7 @@ from fastapi import FastAPI
 from loguru import logger
 
 from python_api_template.internal.db.database import sessionmanager
+from python_api_template.internal.http.pool import http_client_pool
 from python_api_template.internal.config.gunicorn import log_data
 from python_api_template.internal.config.settings import global_settings
 
@@ -11,9 +12,23 @@ from python_api_template.internal.config.settings import global_settings
 @asynccontextmanager
 async def app_lifespan(_: FastAPI):
     sessionmanager.init(
-        global_settings.app.db_url, global_settings.postgres.max_pool_size
+        global_settings.app.db_url,
+        global_settings.postgres.max_pool_size,
+        replica_urls=global_settings.postgres.replica_urls,
+        max_replication_lag=global_settings.postgres.max_replication_lag,
+        replication_lag_check_interval=global_settings.postgres.replication_lag_check_interval,
+        topology=global_settings.postgres.topology,
+        statement_cache_size=global_settings.postgres.statement_cache_size,
+    )
+    http_client_pool.init(
+        max_connections=global_settings.http.max_connections,
+        max_keepalive_connections=global_settings.http.max_keepalive_connections,
+        keepalive_expiry=global_settings.http.keepalive_expiry,
+        http2=global_settings.http.http2,
+        timeout=global_settings.http.timeout,
     )
     logger.info(f"[+] {log_data}")
     yield  # This yield separates startup and shutdown logic
     logger.info("[*] Application shutdown")
+    await http_client_pool.close()
     await sessionmanager.close()
@@ -1,6 +1,7 @@
 import os
 
 from fastapi import FastAPI
+from prometheus_client import REGISTRY
 from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.middleware.cors import CORSMiddleware
 
@@ -43,7 +44,7 @@ def init_app(init_db: bool = True) -> FastAPI:
         allow_headers=["*"],
     )
 
-    Instrumentator().instrument(api).expose(api, tags=["Common"])
+    Instrumentator(registry=REGISTRY).instrument(api).expose(api, tags=["Common"])
 
     api.include_router(common_api_router)
     api.include_router(example_api_router, prefix=global_settings.app.api_v1_str)
@@ -0,0 +1,98 @@
+"""
+Per-call overhead of the decorators applied by `DecoratorMetaclass`.
+
+Times the same coroutine method called bare, wrapped in the nested decorators
+`retry(timeit(log_wrapper(exceptions_wrapper(func))))` and wrapped in the single
+wrapper built by `compile_decorators`. Every behavior is enabled and logs at
+DEBUG, while the only handler accepts INFO and above: the nested decorators
+still format the name and arguments of every call, the compiled wrapper only
+formats them for the lines actually emitted.
+
+    python -m scripts.benchmarks.decorator_chain --iterations 100000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from python_api_template.internal.decorators.compiled_decorator import (
+    compile_decorators,
+)
+from python_api_template.internal.decorators.exception_decorator import (
+    ExceptionsWrapperConfig,
+    exceptions_wrapper,
+)
+from python_api_template.internal.decorators.logger_decorator import (
+    LogWrapperConfig,
+    log_wrapper,
+)
+from python_api_template.internal.decorators.retry_decorator import RetryConfig, retry
+from python_api_template.internal.decorators.timeit_decorator import (
+    TimeItConfig,
+    timeit,
+)
+
+RETRY_CONFIG = RetryConfig(max_attempts=3, delay=0, log_retries=True)
+TIME_IT_CONFIG = TimeItConfig(log_exec_time=True)
+LOG_WRAPPER_CONFIG = LogWrapperConfig(log_level="DEBUG")
+EXCEPTIONS_WRAPPER_CONFIG = ExceptionsWrapperConfig()
+
+
+class Service:
+    async def get(self, key: str, payload: dict[str, Any]) -> dict[str, Any]:
+        return payload
+
+
+def nested(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    func = exceptions_wrapper(EXCEPTIONS_WRAPPER_CONFIG)(func)
+    func = log_wrapper(LOG_WRAPPER_CONFIG)(func)
+    func = timeit(TIME_IT_CONFIG)(func)
+    return retry(RETRY_CONFIG)(func)
+
+
+def compiled(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    return compile_decorators(
+        func,
+        RETRY_CONFIG,
+        TIME_IT_CONFIG,
+        LOG_WRAPPER_CONFIG,
+        EXCEPTIONS_WRAPPER_CONFIG,
+    )
+
+
+async def run(func: Callable[..., Awaitable[Any]], iterations: int) -> float:
+    """Mean microseconds per call."""
+    service = Service()
+    payload = {f"field_{i}": list(range(10)) for i in range(10)}
+    for _ in range(min(iterations, 1_000)):
+        await func(service, "key", payload)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func(service, "key", payload)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    bare = await run(Service.get, args.iterations)
+    for name, func in (
+        ("bare", Service.get),
+        ("nested decorators", nested(Service.get)),
+        ("compiled wrapper", compiled(Service.get)),
+    ):
+        mean = await run(func, args.iterations)
+        print(f"{name:<18} {mean:7.3f}us/call overhead={mean - bare:7.3f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+Latency of `ExampleRepository.find_example` with and without the prepared
+statement cache.
+
+For every topology the benchmark opens its own engine, seeds the `example` table
+inside a transaction that is rolled back at the end, warms the connection up and
+then times the same filtered, sorted page query. Direct connections and
+pgbouncer in session mode reuse the statement prepared on the first call, while
+pgbouncer in transaction mode parses and plans it every time.
+
+Run it from the project root against a migrated database:
+
+    python -m scripts.benchmarks.find_example --rows 1000 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from python_api_template.common.enums import DatabaseTopology, SortOrder
+from python_api_template.example.enums import ExampleSortKey, ExampleStatusEnum
+from python_api_template.example.models.example_model import ExampleModel
+from python_api_template.example.repository import ExampleRepository
+from python_api_template.internal.config.settings import global_settings
+from python_api_template.internal.db.database import (
+    DatabaseSessionManager,
+    get_async_sessionmaker,
+    get_async_sql_engine,
+)
+
+
+async def run(
+    db_url: str, topology: DatabaseTopology, rows: int, iterations: int
+) -> list[float]:
+    connect_args = DatabaseSessionManager._connect_args(
+        db_url, topology, global_settings.postgres.statement_cache_size
+    )
+    engine = get_async_sql_engine(db_url, 1, connect_args)
+    try:
+        async with get_async_sessionmaker(engine)() as session:
+            repository = ExampleRepository(session)
+            now = datetime.now(timezone.utc)
+            await repository.copy_insert(
+                ExampleModel,
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "created_at": now,
+                        "updated_at": now,
+                        "example_name": f"example-{i}",
+                        "example_date": date(2024, 1, 1) + timedelta(days=i % 365),
+                        "example_status": list(ExampleStatusEnum)[
+                            i % len(ExampleStatusEnum)
+                        ],
+                    }
+                    for i in range(rows)
+                ],
+                commit=False,
+            )
+
+            async def query() -> None:
+                await repository.find_example(
+                    example_date=date(2024, 6, 1),
+                    example_status=ExampleStatusEnum.A,
+                    sort_order=SortOrder.DESC,
+                    sort_key=ExampleSortKey.DATE,
+                    skip=0,
+                    limit=50,
+                )
+
+            for _ in range(min(iterations, 100)):
+                await query()
+
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await query()
+                timings.append((time.perf_counter() - start) * 1000)
+
+            await session.rollback()
+        return timings
+    finally:
+        await engine.dispose()
+
+
+def report(topology: DatabaseTopology, timings: list[float]) -> None:
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{topology.value:<22} mean={statistics.fmean(timings):7.3f}ms "
+        f"p50={percentiles[49]:7.3f}ms p95={percentiles[94]:7.3f}ms "
+        f"p99={percentiles[98]:7.3f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-url", default=global_settings.app.db_url)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    for topology in DatabaseTopology:
+        report(topology, await run(args.db_url, topology, args.rows, args.iterations))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Cost of turning an upstream JSON body into pydantic models.
+
+The current path of the callers of `HttpClient.request` decodes the body into
+dicts with `response.json()` and validates them afterwards with
+`model_validate`. The `response_model` path hands the raw bytes to
+`TypeAdapter.validate_json`, which parses and validates in a single pass in
+pydantic-core without building the intermediate Python objects.
+
+Both paths decode the same synthetic page of items, no network is involved:
+
+    python -m scripts.benchmarks.http_response_model --items 1000 --iterations 500
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import httpx
+from pydantic import BaseModel
+
+from python_api_template.internal.http.utils import decode_response
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    price: float
+    tags: list[str]
+    created_at: datetime
+
+
+class Page(BaseModel):
+    items: list[Item]
+    next_cursor: str | None
+
+
+def payload(items: int) -> httpx.Response:
+    now = datetime.now(timezone.utc).isoformat()
+    return httpx.Response(
+        200,
+        json={
+            "items": [
+                {
+                    "id": i,
+                    "name": f"item-{i}",
+                    "price": i * 1.5,
+                    "tags": ["a", "b", "c"],
+                    "created_at": now,
+                }
+                for i in range(items)
+            ],
+            "next_cursor": None,
+        },
+    )
+
+
+def run(decode: Callable[[], Any], iterations: int) -> list[float]:
+    for _ in range(min(iterations, 50)):
+        decode()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        decode()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{name:<28} mean={statistics.fmean(timings):7.3f}ms "
+        f"p50={percentiles[49]:7.3f}ms p95={percentiles[94]:7.3f}ms "
+        f"p99={percentiles[98]:7.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1_000)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    response = payload(args.items)
+    assert Page.model_validate(response.json()) == decode_response(
+        response.content, Page
+    )
+    report(
+        "json() + model_validate",
+        run(lambda: Page.model_validate(response.json()), args.iterations),
+    )
+    report(
+        "TypeAdapter.validate_json",
+        run(lambda: decode_response(response.content, Page), args.iterations),
+    )
+
+
+if __name__ == "__main__":
+    main()
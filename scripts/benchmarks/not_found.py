@@ -0,0 +1,123 @@
+"""
+Latency of a 404 raised through `exceptions_wrapper` compared to a 200.
+
+A service decorated by `DecoratorMetaclass` either returns an item or raises
+`NoResultFound`, which the compiled wrapper turns into a `NotFoundError` with
+the bound arguments of the call as detail. Both are served by a small FastAPI
+app with the exception handlers of the project, called in process through
+`httpx.ASGITransport`, so no database or network is involved. The `eager`
+routes build the detail like `bind_arguments` used to, calling
+`inspect.signature` on every not-found.
+
+    python -m scripts.benchmarks.not_found --iterations 5000
+"""
+
+import argparse
+import asyncio
+import inspect
+import statistics
+import sys
+import time
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.exc import NoResultFound
+
+from python_api_template.common.base_service import BaseService
+from python_api_template.common.exceptions.exception_handlers import (
+    setup_exception_handlers,
+)
+from python_api_template.common.exceptions.exceptions import NotFoundError
+from python_api_template.internal.decorators.exception_decorator import (
+    ExceptionsWrapperConfig,
+)
+from python_api_template.internal.decorators.utils.format_func_and_args_name import (
+    format_func_and_args_name,
+)
+
+ITEMS = {"1": {"id": "1", "name": "item"}}
+
+
+class ItemService(BaseService):
+    exceptions_wrapper_config = ExceptionsWrapperConfig()
+
+    async def get_item(self, item_id: str, fields: list[str] | None = None) -> Any:
+        if item_id not in ITEMS:
+            raise NoResultFound
+        return ITEMS[item_id]
+
+
+async def get_item_eagerly(service: ItemService, item_id: str) -> Any:
+    """The former not-found path: signature and reprs built on every call."""
+    try:
+        if item_id not in ITEMS:
+            raise NoResultFound
+        return ITEMS[item_id]
+    except NoResultFound as exc:
+        _, args_repr = format_func_and_args_name(
+            ItemService.get_item, (service, item_id)
+        )
+        bound = inspect.signature(ItemService.get_item).bind(*args_repr)
+        bound.apply_defaults()
+        logger.debug(bound.arguments)
+        raise NotFoundError(detail=bound.arguments) from exc
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    service = ItemService()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str) -> Any:
+        return await service.get_item(item_id)
+
+    @app.get("/eager/items/{item_id}")
+    async def get_item_eager(item_id: str) -> Any:
+        return await get_item_eagerly(service, item_id)
+
+    setup_exception_handlers(app)
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, iterations: int) -> list[float]:
+    for _ in range(min(iterations, 200)):
+        await client.get(path)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await client.get(path)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{name:<14} mean={statistics.fmean(timings):8.1f}us "
+        f"p50={percentiles[49]:8.1f}us p99={percentiles[98]:8.1f}us"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for name, path in (
+            ("200", "/items/1"),
+            ("404", "/items/2"),
+            ("200 (eager)", "/eager/items/1"),
+            ("404 (eager)", "/eager/items/2"),
+        ):
+            report(name, await run(client, path, args.iterations))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,13 @@
+import csv
+import json
+import uuid
+
 import pytest
 from httpx import AsyncClient
 
+from python_api_template.internal.config.settings import global_settings
+from python_api_template.internal.db.database import DatabaseSessionManager
+
 
 @pytest.mark.asyncio
 async def test_create_example(api_client: AsyncClient):
@@ -27,3 +34,222 @@ async def test_create_example(api_client: AsyncClient):
     assert "id" in response_json
     assert "created_at" in response_json
     assert "updated_at" in response_json
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_key", ["example_status", "example_date"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_get_examples_page_walks_all_items(
+    api_client: AsyncClient, sort_key: str, sort_order: str
+):
+    for day in [3, 1, 2, 1, 3]:
+        response = await api_client.post(
+            "/example/",
+            json={
+                "example_name": f"Example {day}",
+                "example_date": f"2024-04-0{day}",
+                "example_status": "A",
+            },
+        )
+        assert response.status_code == 200
+
+    params = {"sort_key": sort_key, "sort_order": sort_order, "limit": 2}
+    seen: list[dict] = []
+    cursor = None
+    while True:
+        response = await api_client.get(
+            "/example/page", params={**params, **({"cursor": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len({item["id"] for item in seen}) == 5
+    expected = sorted(seen, key=lambda item: (item[sort_key], item["id"]))
+    if sort_order == "desc":
+        expected.reverse()
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_get_examples_returns_requested_total(api_client: AsyncClient):
+    for day in [1, 2, 3]:
+        response = await api_client.post(
+            "/example/",
+            json={
+                "example_name": f"Example {day}",
+                "example_date": f"2024-04-0{day}",
+                "example_status": "A",
+            },
+        )
+        assert response.status_code == 200
+
+    exact = (
+        await api_client.get("/example/page", params={"limit": 2, "total": "exact"})
+    ).json()
+    assert exact["total"] == 3
+    assert exact["has_more"] is None
+
+    first = (
+        await api_client.get("/example/page", params={"limit": 2, "total": "has_more"})
+    ).json()
+    assert len(first["items"]) == 2
+    assert first["has_more"] is True
+    assert first["total"] is None
+    last = (
+        await api_client.get(
+            "/example/page",
+            params={"limit": 2, "total": "has_more", "cursor": first["next_cursor"]},
+        )
+    ).json()
+    assert len(last["items"]) == 1
+    assert last["has_more"] is False
+    assert last["next_cursor"] is None
+
+    estimated = (
+        await api_client.get("/example/page", params={"total": "estimated"})
+    ).json()
+    assert isinstance(estimated["total"], int)
+
+    response = await api_client.get("/example/", params={"limit": 1, "total": "exact"})
+    assert len(response.json()) == 1
+    assert response.headers["X-Total-Count"] == "3"
+    response = await api_client.get("/example/", params={"total": "has_more"})
+    assert response.headers["X-Has-More"] == "false"
+
+
+@pytest.mark.asyncio
+async def test_get_examples_page_rejects_invalid_cursor(api_client: AsyncClient):
+    response = await api_client.get("/example/page", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_examples_streams_all_rows(
+    api_client: AsyncClient, export_format: str
+):
+    for day in [2, 1, 3]:
+        response = await api_client.post(
+            "/example/",
+            json={
+                "example_name": f"Example {day}",
+                "example_date": f"2024-04-0{day}",
+                "example_status": "A",
+            },
+        )
+        assert response.status_code == 200
+
+    response = await api_client.get(
+        "/example/export", params={"format": export_format, "sort_key": "example_date"}
+    )
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    if export_format == "ndjson":
+        assert response.headers["content-type"] == "application/x-ndjson"
+        dates = [json.loads(line)["example_date"] for line in lines]
+    else:
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(lines))
+        dates = [row["example_date"] for row in rows]
+    assert dates == ["2024-04-01", "2024-04-02", "2024-04-03"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_examples_reports_every_item(api_client: AsyncClient):
+    items = [
+        {"example_name": "First", "example_date": "2024-04-01", "example_status": "A"},
+        {"example_name": "Invalid", "example_date": "2024-04-01", "example_number": 99},
+        {
+            "example_name": "Second",
+            "example_date": "2024-04-02",
+            "example_number": 5,
+            "example_status": "B",
+            "example_boolean": False,
+        },
+    ]
+
+    response = await api_client.post("/example/bulk", json=items)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2
+    assert result["rejected"] == 1
+    assert [item["index"] for item in result["items"]] == [0, 1, 2]
+    assert result["items"][1]["id"] is None
+    assert result["items"][1]["errors"]
+
+    created = await api_client.get(f"/example/{result['items'][0]['id']}")
+    assert created.status_code == 200
+    assert created.json()["example_number"] == 1
+    assert created.json()["example_boolean"] is True
+
+    second = await api_client.get(f"/example/{result['items'][2]['id']}")
+    assert second.json()["example_status"] == "B"
+    assert second.json()["example_boolean"] is False
+
+
+async def test_bulk_create_examples_reports_items_rejected_by_the_database(
+    api_client: AsyncClient, mocker
+):
+    duplicate_id = uuid.uuid4()
+    mocker.patch(
+        "python_api_template.example.service.uuid4",
+        side_effect=[uuid.uuid4(), duplicate_id, duplicate_id],
+    )
+    items = [
+        {"example_name": "Valid", "example_date": "2024-04-01", "example_status": "A"},
+        {"example_name": "First", "example_date": "2024-04-02", "example_status": "A"},
+        {
+            "example_name": "Duplicate",
+            "example_date": "2024-04-03",
+            "example_status": "A",
+        },
+    ]
+
+    response = await api_client.post("/example/bulk", json=items)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2
+    assert result["rejected"] == 1
+    assert result["items"][1]["id"] == str(duplicate_id)
+    assert result["items"][2]["id"] is None
+    assert result["items"][2]["errors"][0]["message"]
+    created = await api_client.get(f"/example/{duplicate_id}")
+    assert created.json()["example_name"] == "First"
+
+
+async def test_only_read_endpoints_open_a_replica_session(
+    api_client: AsyncClient,
+    sessionmanager_for_tests: DatabaseSessionManager,
+    migrated_postgres: str,
+    mocker,
+):
+    await sessionmanager_for_tests.close()
+    sessionmanager_for_tests.init(
+        migrated_postgres,
+        global_settings.postgres.max_pool_size,
+        replica_urls=[migrated_postgres],
+    )
+    read_session = mocker.spy(sessionmanager_for_tests, "read_session")
+
+    created = await api_client.post(
+        "/example/",
+        json={
+            "example_name": "Written",
+            "example_date": "2024-04-04",
+            "example_status": "A",
+        },
+    )
+    assert created.status_code == 200
+    assert read_session.call_count == 0
+
+    found = await api_client.get(f"/example/{created.json()['id']}")
+    assert found.status_code == 200
+    assert read_session.call_count == 1
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from python_api_template.example.enums import ExampleStatusEnum
+from python_api_template.example.repository import ExampleRepository
+from python_api_template.example.schemas import CreateExampleSchema
+from python_api_template.example.service import ExampleService
+from python_api_template.internal.db.database import DatabaseSessionManager
+
+
+class CachedExampleService(ExampleService):
+    cache_config = ExampleService.cache_config.model_copy(update={"enabled": True})
+
+    get_example = ExampleService.get_example
+
+
+async def test_cached_listing_is_loaded_on_its_own_session_and_cleared_by_writes(
+    sessionmanager_for_tests: DatabaseSessionManager, session: AsyncSession, mocker
+):
+    CachedExampleService.get_example.cache_clear()
+    find_example = mocker.spy(ExampleRepository, "find_example")
+    service = CachedExampleService(session)
+    example_date, status = date(2024, 4, 4), ExampleStatusEnum.A
+
+    def create_schema(name: str) -> CreateExampleSchema:
+        return CreateExampleSchema(
+            example_name=name,
+            example_date=example_date.isoformat(),
+            example_status=status,
+        )
+
+    first = await service.create(create_schema("first"))
+    listings = await asyncio.gather(
+        *(service.get_example(example_date, status) for _ in range(3))
+    )
+    assert [[item.id for item in listing] for listing in listings] == [[first.id]] * 3
+    assert find_example.call_count == 1
+    # The shared call did not run on the session of the request missing first
+    assert find_example.call_args.args[0].async_session is not session
+
+    await service.get_example(example_date, status)
+    assert find_example.call_count == 1
+
+    second = await service.create(create_schema("second"))
+    listing = await service.get_example(example_date, status)
+    assert {item.id for item in listing} == {first.id, second.id}
+
+    await service.delete(first.id)
+    listing = await service.get_example(example_date, status)
+    assert [item.id for item in listing] == [second.id]
+    assert find_example.call_count == 3
@@ -0,0 +1,105 @@
+import asyncio
+import math
+
+import pytest
+
+from sqlalchemy import event, text
+
+from python_api_template.common.enums import DatabaseTopology
+from python_api_template.internal.config.settings import (
+    PostgresDatabaseSettings,
+    global_settings,
+)
+from python_api_template.internal.db.database import DatabaseSessionManager
+
+
+async def test_read_session_uses_replica(
+    sessionmanager_for_tests: DatabaseSessionManager, migrated_postgres: str
+):
+    await sessionmanager_for_tests.close()
+    sessionmanager_for_tests.init(
+        migrated_postgres,
+        global_settings.postgres.max_pool_size,
+        replica_urls=[migrated_postgres],
+    )
+    replica = sessionmanager_for_tests._replicas[0]
+
+    async with sessionmanager_for_tests.read_session() as session:
+        assert session.bind is replica.engine
+        assert await session.scalar(text("SELECT 1")) == 1
+    assert replica.lag == 0.0
+
+
+async def test_read_session_falls_back_to_primary_when_replicas_lag(
+    sessionmanager_for_tests: DatabaseSessionManager, migrated_postgres: str
+):
+    await sessionmanager_for_tests.close()
+    sessionmanager_for_tests.init(
+        migrated_postgres,
+        global_settings.postgres.max_pool_size,
+        replica_urls=[migrated_postgres],
+        max_replication_lag=1.0,
+        replication_lag_check_interval=60,
+    )
+    replica = sessionmanager_for_tests._replicas[0]
+    replica.lag, replica.lag_checked_at = math.inf, math.inf
+
+    async with sessionmanager_for_tests.read_session() as session:
+        assert session.bind is sessionmanager_for_tests._engine
+
+
+async def test_replication_lag_is_checked_once_per_interval(
+    sessionmanager_for_tests: DatabaseSessionManager, migrated_postgres: str
+):
+    await sessionmanager_for_tests.close()
+    sessionmanager_for_tests.init(
+        migrated_postgres,
+        global_settings.postgres.max_pool_size,
+        replica_urls=[migrated_postgres],
+        replication_lag_check_interval=60,
+    )
+    replica = sessionmanager_for_tests._replicas[0]
+    statements: list[str] = []
+    event.listen(
+        replica.engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    replicas = await asyncio.gather(
+        *(sessionmanager_for_tests._pick_replica() for _ in range(5))
+    )
+    assert await sessionmanager_for_tests._pick_replica() is replica
+
+    assert sum("pg_last_xact_replay_timestamp" in s for s in statements) == 1
+    # Requests racing the first check read from the primary meanwhile
+    assert replicas.count(None) == 4
+
+
+@pytest.mark.parametrize(
+    "topology, expected",
+    [
+        (DatabaseTopology.DIRECT, 256),
+        (DatabaseTopology.PGBOUNCER_SESSION, 256),
+        (DatabaseTopology.PGBOUNCER_TRANSACTION, 0),
+    ],
+)
+def test_statement_cache_follows_topology(topology: DatabaseTopology, expected: int):
+    connect_args = DatabaseSessionManager._connect_args(
+        "postgresql+asyncpg://localhost/app", topology, 256
+    )
+
+    assert connect_args == {
+        "statement_cache_size": expected,
+        "prepared_statement_cache_size": expected,
+    }
+
+
+def test_prepared_statements_are_disabled_by_default():
+    topology = PostgresDatabaseSettings.model_fields["topology"].default
+    connect_args = DatabaseSessionManager._connect_args(
+        "postgresql+asyncpg://localhost/app", topology, 256
+    )
+
+    assert topology is DatabaseTopology.PGBOUNCER_TRANSACTION
+    assert connect_args["statement_cache_size"] == 0
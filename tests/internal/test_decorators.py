@@ -0,0 +1,403 @@
+import asyncio
+import traceback
+
+import pytest
+from loguru import logger
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import DBAPIError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from python_api_template.common.base_service import BaseService
+from python_api_template.common.exceptions.exceptions import NotFoundError
+from python_api_template.example.repository import ExampleRepository
+from python_api_template.internal.decorators import compiled_decorator
+from python_api_template.internal.decorators.cache_decorator import CacheConfig
+from python_api_template.internal.decorators.decorator_metaclass import (
+    DecoratorMetaclass,
+)
+from python_api_template.internal.decorators.exception_decorator import (
+    ExceptionsWrapperConfig,
+)
+from python_api_template.internal.decorators.logger_decorator import LogWrapperConfig
+from python_api_template.internal.decorators.retry_decorator import (
+    RetryConfig,
+    backoff_delay,
+)
+from python_api_template.internal.decorators.timeit_decorator import (
+    MetricConfigurationError,
+    TimeItConfig,
+    timeit,
+)
+from python_api_template.internal.decorators.utils.token_bucket import TokenBucket
+
+
+class Argument:
+    reprs = 0
+
+    def __repr__(self) -> str:
+        Argument.reprs += 1
+        return "Argument()"
+
+
+class Service(metaclass=DecoratorMetaclass):
+    retry_config = RetryConfig(enabled=True, max_attempts=3, delay=0, log_retries=True)
+    time_it_config = TimeItConfig(enabled=True, log_exec_time=True)
+    log_wrapper_config = LogWrapperConfig(enabled=True, log_level="DEBUG")
+    exceptions_wrapper_config = ExceptionsWrapperConfig(enabled=True)
+
+    def __init__(self):
+        self.calls = 0
+
+    async def flaky(self, argument: Argument, failures: int = 1) -> str:
+        self.calls += 1
+        if self.calls <= failures:
+            raise ValueError("flaky")
+        return "ok"
+
+    async def missing(self, key: str) -> None:
+        self.calls += 1
+        raise NoResultFound
+
+    def synchronous(self) -> str:
+        return "not wrapped"
+
+
+@pytest.fixture
+def messages():
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="DEBUG", format="{message}")
+    yield messages
+    logger.remove(handler_id)
+
+
+async def test_compiled_wrapper_retries_times_and_logs(messages: list[str]):
+    service = Service()
+
+    assert await service.flaky(Argument()) == "ok"
+
+    assert service.calls == 2
+    assert (
+        "[+] Entering 'Service.flaky' (args=['Service', 'Argument()'], kwargs={})\n"
+        in messages
+    )
+    assert "[x] Exception in 'Service.flaky': flaky\n" in messages
+    assert "[*] Execution of function Service.flaky failed on attempt 1/3\n" in messages
+    assert any("'Service.flaky' executed in" in message for message in messages)
+    assert Service.flaky.__name__ == "flaky"
+    assert Service().synchronous() == "not wrapped"
+
+
+async def test_compiled_wrapper_maps_exceptions():
+    with pytest.raises(Exception) as error:
+        await Service().missing(key="key")
+
+    assert isinstance(error.value.__cause__, NotFoundError)
+    assert error.value.__cause__.detail == {"self": "Service", "key": "key"}
+    # The wrapper is plain source, so its frame shows up in the traceback
+    frames = traceback.extract_tb(error.value.__cause__.__traceback__)
+    assert frames[0].filename == compiled_decorator.__file__
+    assert frames[0].name == "wrapped"
+
+
+async def test_not_found_detail_is_built_when_read():
+    class LookupService(metaclass=DecoratorMetaclass):
+        exceptions_wrapper_config = ExceptionsWrapperConfig()
+
+        async def find(self, argument: Argument, limit: int = 1) -> None:
+            raise NoResultFound
+
+    Argument.reprs = 0
+    with pytest.raises(NotFoundError) as error:
+        await LookupService().find(Argument())
+
+    assert Argument.reprs == 0
+    expected = {"self": "LookupService", "argument": "Argument()", "limit": 1}
+    assert error.value.detail == expected
+    assert error.value.detail == expected
+    assert Argument.reprs == 1
+
+
+async def test_retry_skips_non_retryable_errors_and_honors_the_deadline():
+    service = Service()
+    with pytest.raises(Exception):
+        await service.missing(key="key")
+    assert service.calls == 1
+
+    class SlowRetryService(metaclass=DecoratorMetaclass):
+        retry_config = RetryConfig(max_attempts=5, delay=10, jitter=False, deadline=1)
+
+        async def fail(self) -> None:
+            raise ValueError
+
+    with pytest.raises(ValueError):
+        await SlowRetryService().fail()
+
+
+def test_backoff_delay_is_exponential_and_capped(mocker):
+    config = RetryConfig(delay=1, backoff=2, max_delay=5, jitter=False)
+    assert [backoff_delay(attempt, config) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+    uniform = mocker.patch(
+        "python_api_template.internal.decorators.retry_decorator.random.uniform"
+    )
+    backoff_delay(3, config.model_copy(update={"jitter": True}))
+    uniform.assert_called_once_with(0, 4)
+
+
+async def test_transient_db_errors_are_rolled_back_and_retried(
+    session: AsyncSession, mocker
+):
+    class FlakyDbService(BaseService):
+        retry_config = RetryConfig(max_attempts=2, delay=0)
+
+        def __init__(self, async_session: AsyncSession):
+            self.repository = ExampleRepository(async_session)
+            self.calls = 0
+
+        async def run(self) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                raise DBAPIError(
+                    "SELECT 1", None, ConnectionError(), connection_invalidated=True
+                )
+            return "ok"
+
+    rollback = mocker.spy(session, "rollback")
+
+    assert await FlakyDbService(session).run() == "ok"
+    assert rollback.call_count == 1
+
+
+async def test_arguments_are_only_formatted_when_logged():
+    class QuietService(metaclass=DecoratorMetaclass):
+        # TRACE lines are below the level of the default handler
+        retry_config = RetryConfig(delay=0, log_retries=True, log_level="TRACE")
+        time_it_config = TimeItConfig(log_exec_time=True, log_level="TRACE")
+        log_wrapper_config = LogWrapperConfig(log_level="TRACE")
+
+        async def echo(self, argument: Argument) -> Argument:
+            return argument
+
+    Argument.reprs = 0
+
+    await QuietService().echo(Argument())
+
+    assert Argument.reprs == 0
+
+
+async def test_timeit_records_durations_in_a_histogram():
+    class TimedService(metaclass=DecoratorMetaclass):
+        time_it_config = TimeItConfig(
+            record_metrics=True,
+            metric_name="test_service_method_duration_seconds",
+            buckets=(0.1, 1.0),
+        )
+
+        async def fail(self) -> None:
+            raise ValueError
+
+    labels = {"class": "TimedService", "method": "fail", "le": "0.1"}
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await TimedService().fail()
+
+    assert (
+        REGISTRY.get_sample_value("test_service_method_duration_seconds_bucket", labels)
+        == 2
+    )
+    # Other buckets cannot be used under the same name
+    config = TimeItConfig(
+        record_metrics=True, metric_name="test_service_method_duration_seconds"
+    )
+    with pytest.raises(MetricConfigurationError, match="TimedService.fail"):
+        timeit(config)(TimedService.fail)
+
+
+async def test_services_share_a_histogram_only_with_the_same_buckets():
+    config = TimeItConfig(
+        record_metrics=True, metric_name="test_shared_duration_seconds"
+    )
+
+    class First(metaclass=DecoratorMetaclass):
+        time_it_config = config
+
+        async def run(self) -> None:
+            pass
+
+    class Second(metaclass=DecoratorMetaclass):
+        time_it_config = config
+
+        async def run(self) -> None:
+            pass
+
+    await First().run()
+    await Second().run()
+    for owner in ("First", "Second"):
+        labels = {"class": owner, "method": "run"}
+        assert (
+            REGISTRY.get_sample_value("test_shared_duration_seconds_count", labels) == 1
+        )
+
+    with pytest.raises(MetricConfigurationError) as error:
+
+        class Third(metaclass=DecoratorMetaclass):
+            time_it_config = config.model_copy(update={"buckets": (1.0,)})
+
+            async def run(self) -> None:
+                pass
+
+    assert "Third.run" in str(error.value)
+    assert "First.run" in str(error.value)
+
+
+async def test_log_wrapper_samples_rate_limits_and_truncates(
+    messages: list[str], mocker
+):
+    class SampledService(metaclass=DecoratorMetaclass):
+        log_wrapper_config = LogWrapperConfig(
+            log_entry=False,
+            sample_rate=2,
+            rate_limit=1,
+            rate_limit_burst=2,
+            max_result_length=5,
+        )
+
+        async def get(self) -> str:
+            return "abcdefghij"
+
+    random = mocker.patch(
+        "python_api_template.internal.decorators.logger_decorator.random.random"
+    )
+    random.side_effect = [0.9, 0.1, 0.1, 0.1]
+    service = SampledService()
+    for _ in range(4):
+        assert await service.get() == "abcdefghij"
+
+    # The first call is not sampled, the fourth one exceeds the burst
+    assert (
+        messages
+        == ["[+] Exiting 'SampledService.get' (result=abcde... (10 characters))\n"] * 2
+    )
+
+
+def test_token_bucket_refills_at_its_rate(mocker):
+    monotonic = mocker.patch(
+        "python_api_template.internal.decorators.utils.token_bucket.time.monotonic"
+    )
+    monotonic.return_value = 0
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+    monotonic.return_value = 0.5
+    assert [bucket.try_acquire() for _ in range(2)] == [True, False]
+
+
+class CachedService(metaclass=DecoratorMetaclass):
+    cache_config = CacheConfig(
+        methods=("get", "find"), ttl=10, ttls={"find": 1}, max_entries=2
+    )
+    calls = 0
+
+    async def get(self, key: str, options: dict | None = None) -> list[str]:
+        CachedService.calls += 1
+        await asyncio.sleep(0)
+        return [key]
+
+    async def find(self, key: object) -> object:
+        CachedService.calls += 1
+        return key
+
+    async def save(self, key: str) -> str:
+        CachedService.calls += 1
+        return key
+
+
+def cache_requests(method: str, result: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "service_cache_requests_total",
+            {"class": "CachedService", "method": method, "result": result},
+        )
+        or 0
+    )
+
+
+async def test_cache_shares_concurrent_misses_and_serves_copies():
+    CachedService.get.cache_clear()
+    CachedService.calls = 0
+    hits, misses = cache_requests("get", "hit"), cache_requests("get", "miss")
+
+    results = await asyncio.gather(
+        *(CachedService().get("a", options={"x": [1]}) for _ in range(3))
+    )
+    results[0].append("changed")
+    assert await CachedService().get(key="a", options={"x": [1]}) == ["a"]
+    assert await CachedService().save("a") == "a"
+    assert await CachedService().save("a") == "a"
+
+    assert results[1:] == [["a"], ["a"]]
+    assert CachedService.calls == 3
+    assert cache_requests("get", "miss") - misses == 3
+    assert cache_requests("get", "hit") - hits == 1
+
+
+async def test_cache_expires_evicts_and_bypasses_unhashable_keys(mocker):
+    monotonic = mocker.patch(
+        "python_api_template.internal.decorators.cache_decorator.time.monotonic"
+    )
+    monotonic.return_value = 0
+    CachedService.get.cache_clear()
+    CachedService.find.cache_clear()
+    CachedService.calls = 0
+    service = CachedService()
+
+    for key in ("a", "b", "a", "c", "a", "b"):
+        await service.get(key)
+    # "b" was evicted by "c", being the least recently used of the 2 entries
+    assert CachedService.calls == 4
+
+    await service.find("a")
+    monotonic.return_value = 1
+    await service.find("a")
+    await service.get("a")
+    assert CachedService.calls == 6
+
+    bypasses = cache_requests("find", "bypass")
+    await service.find(bytearray(b"a"))
+    assert cache_requests("find", "bypass") - bypasses == 1
+
+
+class ScopedService(metaclass=DecoratorMetaclass):
+    cache_config = CacheConfig(methods=("get",), invalidated_by=("save",))
+    calls = 0
+
+    def __init__(self, scope: str):
+        self.cache_scope = scope
+
+    async def get(self, key: str) -> str:
+        ScopedService.calls += 1
+        await asyncio.sleep(0)
+        return f"{self.cache_scope}:{key}"
+
+    async def save(self, key: str) -> str:
+        return key
+
+
+async def test_cache_keys_results_by_scope_and_is_cleared_by_writes():
+    ScopedService.get.cache_clear()
+    ScopedService.calls = 0
+    service = ScopedService("a")
+
+    assert await service.get("x") == "a:x"
+    assert await ScopedService("b").get("x") == "b:x"
+    assert await ScopedService("a").get("x") == "a:x"
+    assert ScopedService.calls == 2
+
+    # Read before the write, it is neither cached nor shared with later calls
+    in_flight = asyncio.ensure_future(service.get("y"))
+    await asyncio.sleep(0)
+    await service.save("y")
+    await asyncio.gather(in_flight, service.get("y"))
+    await service.get("y")
+    await service.get("x")
+    assert ScopedService.calls == 5
@@ -0,0 +1,545 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from pydantic import BaseModel
+from pytest_httpx import HTTPXMock
+
+from python_api_template.common.exceptions.enums import RequestMethod
+from python_api_template.common.exceptions.exceptions import (
+    MethodNotAllowedError,
+    NotFoundError,
+    PydanticError,
+    ServiceUnavailableError,
+)
+from python_api_template.internal.http.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    circuit_breakers,
+)
+from python_api_template.internal.http.client import HttpClient
+from python_api_template.internal.http.decorators import backoff_delay, retry_after
+from python_api_template.internal.http.fan_out import RequestSpec
+from python_api_template.internal.http.hedging import HedgingPolicy, hedging_policies
+from python_api_template.internal.http.pool import HttpClientPool, http_client_pool
+from python_api_template.internal.http.response_cache import (
+    CachedResponse,
+    InMemoryResponseCache,
+)
+from python_api_template.internal.http.retry_budget import RetryBudget, retry_budgets
+from python_api_template.internal.http.singleflight import singleflight
+from python_api_template.internal.utils.pathutils import aiter_file
+
+
+@pytest.fixture
+async def http_pool():
+    http_client_pool.init()
+    yield http_client_pool
+    await http_client_pool.close()
+    retry_budgets.clear()
+    circuit_breakers.clear()
+    hedging_policies.clear()
+
+
+@pytest.fixture
+def sleep(mocker):
+    return mocker.patch("python_api_template.internal.http.decorators.asyncio.sleep")
+
+
+async def test_clients_of_the_same_origin_share_a_pool(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(url="https://upstream.test/a?x=1", json={"a": 1})
+    httpx_mock.add_response(url="https://upstream.test/b", json={"b": 2})
+    first, second = (
+        HttpClient("https://upstream.test"),
+        HttpClient("https://upstream.test/"),
+    )
+
+    assert await first.request("/a", RequestMethod.GET, data={"x": 1}) == {"a": 1}
+    assert await second.request("/b", RequestMethod.POST) == {"b": 2}
+    assert first.client is second.client
+    assert HttpClient("https://other.test").client is not first.client
+
+
+async def test_request_maps_status_errors(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(url="https://upstream.test/missing", status_code=404)
+
+    with pytest.raises(NotFoundError):
+        await HttpClient("https://upstream.test").request("/missing", RequestMethod.GET)
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+async def test_request_validates_the_body_into_the_response_model(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        url="https://upstream.test/items",
+        json=[{"id": 1, "name": "a"}, {"id": "2", "name": "b"}],
+        headers={"Cache-Control": "max-age=60"},
+    )
+    httpx_mock.add_response(url="https://upstream.test/item", json={"id": "x"})
+    client = HttpClient("https://upstream.test", response_cache=InMemoryResponseCache())
+
+    for _ in range(2):
+        items = await client.request(
+            "/items", RequestMethod.GET, response_model=list[Item]
+        )
+        assert items == [Item(id=1, name="a"), Item(id=2, name="b")]
+    with pytest.raises(PydanticError) as error:
+        await client.request("/item", RequestMethod.GET, response_model=Item)
+
+    assert [e.parameter for e in error.value.detail] == ["id", "name"]
+    assert len(httpx_mock.get_requests(url="https://upstream.test/items")) == 1
+
+
+async def test_pool_must_be_initialized():
+    with pytest.raises(IOError):
+        HttpClient("https://upstream.test").client
+
+
+async def test_retries_idempotent_requests_honoring_retry_after(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock, sleep
+):
+    httpx_mock.add_response(status_code=503, headers={"Retry-After": "2"})
+    httpx_mock.add_response(status_code=502)
+    httpx_mock.add_response(json={"ok": True})
+
+    result = await HttpClient("https://upstream.test").request("/", RequestMethod.GET)
+
+    assert result == {"ok": True}
+    assert len(httpx_mock.get_requests()) == 3
+    assert sleep.call_args_list[0].args == (2.0,)
+
+
+async def test_does_not_retry_non_idempotent_requests_on_5xx(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock, sleep
+):
+    httpx_mock.add_response(status_code=503)
+
+    with pytest.raises(ServiceUnavailableError):
+        await HttpClient("https://upstream.test").request("/", RequestMethod.POST)
+
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_does_not_retry_once_the_budget_is_spent(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock, sleep
+):
+    httpx_mock.add_response(status_code=429)
+    retry_budgets["https://upstream.test"] = RetryBudget(ratio=0, min_retries=0)
+
+    with pytest.raises(ServiceUnavailableError):
+        await HttpClient("https://upstream.test").request("/", RequestMethod.POST)
+
+    assert len(httpx_mock.get_requests()) == 1
+    sleep.assert_not_called()
+
+
+def test_backoff_delay_is_capped_full_jitter(mocker):
+    uniform = mocker.patch(
+        "python_api_template.internal.http.decorators.random.uniform",
+        side_effect=lambda low, high: high,
+    )
+
+    assert [backoff_delay(attempt, 0.5, 3) for attempt in range(1, 5)] == [
+        0.5,
+        1,
+        2,
+        3,
+    ]
+    assert uniform.call_args.args[0] == 0
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    in_a_minute = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    assert retry_after(httpx.Response(503, headers={"Retry-After": "7"})) == 7
+    assert (
+        55
+        < retry_after(
+            httpx.Response(503, headers={"Retry-After": format_datetime(in_a_minute)})
+        )
+        <= 60
+    )
+    assert retry_after(httpx.Response(503, headers={"Retry-After": "soon"})) is None
+    assert retry_after(httpx.Response(503)) is None
+
+
+async def test_open_circuit_fails_fast(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    host = "https://upstream.test"
+    circuit_breakers[host] = CircuitBreaker(host, window_size=2, minimum_calls=2)
+    httpx_mock.add_response(status_code=500)
+    httpx_mock.add_response(status_code=500)
+    client = HttpClient(host)
+
+    for _ in range(3):
+        with pytest.raises(ServiceUnavailableError):
+            await client.request("/", RequestMethod.POST)
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert client.circuit_breaker.state is CircuitState.OPEN
+    assert REGISTRY.get_sample_value("http_circuit_breaker_state", {"host": host}) == 2
+
+
+@pytest.mark.parametrize(
+    "response, response_model, opens",
+    [
+        ({"status_code": 200, "json": {"unexpected": 1}}, Item, True),
+        ({"status_code": 200, "content": b"<html>"}, None, True),
+        ({"status_code": 429}, None, True),
+        ({"status_code": 404}, None, False),
+        ({"status_code": 422}, None, False),
+    ],
+)
+async def test_circuit_breaker_counts_upstream_failures_only(
+    http_pool: HttpClientPool,
+    httpx_mock: HTTPXMock,
+    sleep,
+    response: dict,
+    response_model: type | None,
+    opens: bool,
+):
+    host = "https://upstream.test"
+    circuit_breakers[host] = CircuitBreaker(host, window_size=2, minimum_calls=2)
+    httpx_mock.add_response(**response)
+    client = HttpClient(host)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await client.request("/", RequestMethod.POST, response_model=response_model)
+
+    expected = CircuitState.OPEN if opens else CircuitState.CLOSED
+    assert client.circuit_breaker.state is expected
+
+
+async def test_circuit_breaker_ignores_requests_rejected_before_sending(
+    http_pool: HttpClientPool, mocker
+):
+    client = HttpClient("https://upstream.test")
+    record = mocker.spy(client.circuit_breaker, "record")
+
+    with pytest.raises(MethodNotAllowedError):
+        await client.request("/", RequestMethod.GET, files={"f": b"x"})
+
+    assert record.call_count == 0
+
+
+def test_circuit_breaker_probes_before_closing(mocker):
+    monotonic = mocker.patch(
+        "python_api_template.internal.http.circuit_breaker.time.monotonic",
+        return_value=0,
+    )
+    breaker = CircuitBreaker(
+        "https://slow.test",
+        slow_call_duration=1,
+        window_size=4,
+        minimum_calls=4,
+        open_duration=10,
+        half_open_calls=2,
+    )
+
+    for duration in [0.1, 2, 0.1, 2]:
+        assert breaker.allow_request()
+        breaker.record(duration, failed=False)
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    monotonic.return_value = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record(0.1, failed=False)
+    breaker.record(0.1, failed=False)
+    assert breaker.state is CircuitState.CLOSED
+
+
+async def test_coalesces_concurrent_identical_gets(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(url="https://upstream.test/ref?x=1", json={"a": [1]})
+    httpx_mock.add_response(url="https://upstream.test/missing", status_code=404)
+    client = HttpClient("https://upstream.test", coalesce=True)
+
+    results = await asyncio.gather(
+        *[client.request("/ref", RequestMethod.GET, data={"x": 1}) for _ in range(3)]
+    )
+    errors = await asyncio.gather(
+        *[client.request("/missing", RequestMethod.GET) for _ in range(2)],
+        return_exceptions=True,
+    )
+
+    assert results == [{"a": [1]}] * 3
+    assert results[0] is not results[1]
+    assert all(isinstance(error, NotFoundError) for error in errors)
+    assert len(httpx_mock.get_requests()) == 2
+    assert len(singleflight) == 0
+
+
+async def test_does_not_coalesce_unless_asked(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(json={})
+    httpx_mock.add_response(json={})
+    client = HttpClient("https://upstream.test")
+
+    await asyncio.gather(*[client.request("/", RequestMethod.GET) for _ in range(2)])
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+async def test_caches_fresh_responses_and_revalidates_stale_ones(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        url="https://upstream.test/fresh",
+        json={"fresh": True},
+        headers={"Cache-Control": "max-age=60"},
+    )
+    httpx_mock.add_response(
+        url="https://upstream.test/etag", json={"v": 1}, headers={"ETag": '"v1"'}
+    )
+    httpx_mock.add_response(
+        url="https://upstream.test/etag",
+        status_code=304,
+        match_headers={"If-None-Match": '"v1"'},
+    )
+    httpx_mock.add_response(
+        url="https://upstream.test/private",
+        json={},
+        headers={"Cache-Control": "no-store, max-age=60"},
+    )
+    httpx_mock.add_response(url="https://upstream.test/private", json={})
+    cache = InMemoryResponseCache()
+    client = HttpClient("https://upstream.test", response_cache=cache)
+
+    for _ in range(2):
+        assert await client.request("/fresh", RequestMethod.GET) == {"fresh": True}
+        assert await client.request("/etag", RequestMethod.GET) == {"v": 1}
+        assert await client.request("/private", RequestMethod.GET) == {}
+
+    assert len(httpx_mock.get_requests(url="https://upstream.test/fresh")) == 1
+    assert len(httpx_mock.get_requests(url="https://upstream.test/etag")) == 2
+    assert len(cache) == 2
+
+
+async def test_not_modified_without_an_entry_to_answer_from_is_requested_again(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    cache = InMemoryResponseCache()
+    client = HttpClient("https://upstream.test", response_cache=cache)
+
+    def evict_and_answer_not_modified(request: httpx.Request) -> httpx.Response:
+        # The entry is evicted while the revalidation is in flight, and the 304
+        # forbids storing it again
+        cache._entries.clear()
+        return httpx.Response(304, headers={"Cache-Control": "no-store"})
+
+    httpx_mock.add_response(json={"v": 1}, headers={"ETag": '"v1"'})
+    httpx_mock.add_callback(
+        evict_and_answer_not_modified, match_headers={"If-None-Match": '"v1"'}
+    )
+    httpx_mock.add_response(json={"v": 2}, headers={"ETag": '"v2"'})
+
+    assert await client.request("/", RequestMethod.GET) == {"v": 1}
+    assert await client.request("/", RequestMethod.GET) == {"v": 2}
+
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 3
+    assert "If-None-Match" not in requests[2].headers
+    assert len(cache) == 1
+
+
+async def test_response_cache_evicts_least_recently_used_by_size():
+    cache = InMemoryResponseCache(max_bytes=25)
+
+    def entry(content: bytes) -> CachedResponse:
+        return CachedResponse(content, {}, expires_at=0)
+
+    await cache.set("a", entry(b"a" * 10))
+    await cache.set("b", entry(b"b" * 10))
+    await cache.get("a")
+    await cache.set("c", entry(b"c" * 10))
+    await cache.set("huge", entry(b"h" * 30))
+
+    assert await cache.get("b") is None
+    assert await cache.get("huge") is None
+    assert (await cache.get("a")).content == b"a" * 10
+    assert cache.size == 20
+
+
+async def test_request_many_keeps_order_and_captures_errors(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    in_flight, peak = 0, 0
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        item = int(request.url.params["item"])
+        await asyncio.sleep(0.01 * (5 - item))
+        in_flight -= 1
+        if item == 2:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"item": item})
+
+    httpx_mock.add_callback(respond)
+    client = HttpClient("https://upstream.test")
+
+    results = await client.request_many(
+        [RequestSpec("/", data={"item": item}) for item in range(5)],
+        max_concurrency=2,
+    )
+
+    assert [result.result for result in results] == [
+        {"item": 0},
+        {"item": 1},
+        None,
+        {"item": 3},
+        {"item": 4},
+    ]
+    assert isinstance(results[2].error, NotFoundError)
+    assert [result.ok for result in results] == [True, True, False, True, True]
+    assert peak == 2
+
+
+@pytest.mark.parametrize(
+    "options, error",
+    [({"fail_fast": True}, asyncio.CancelledError), ({"timeout": 0.05}, TimeoutError)],
+)
+async def test_request_many_cancels_remaining_calls(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock, options: dict, error: type
+):
+    async def respond(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow":
+            await asyncio.sleep(10)
+        return httpx.Response(404 if "fail_fast" in options else 200, json={})
+
+    httpx_mock.add_callback(respond)
+    client = HttpClient("https://upstream.test")
+
+    results = await asyncio.wait_for(
+        client.request_many(
+            [RequestSpec("/fast"), RequestSpec("/slow"), RequestSpec("/slow")],
+            **options,
+        ),
+        timeout=1,
+    )
+
+    assert results[0].ok is ("fail_fast" not in options)
+    assert all(isinstance(result.error, error) for result in results[1:])
+
+
+async def test_stream_request_yields_chunks_or_ndjson_lines(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(url="https://upstream.test/raw", content=b"0123456789")
+    httpx_mock.add_response(
+        url="https://upstream.test/ndjson", content=b'{"a": 1}\n\n{"a": 2}\n'
+    )
+    client = HttpClient("https://upstream.test")
+
+    chunks = [chunk async for chunk in client.stream_request("/raw", chunk_size=4)]
+    lines = [line async for line in client.stream_request("/ndjson", ndjson=True)]
+
+    assert chunks == [b"0123", b"4567", b"89"]
+    assert lines == [{"a": 1}, {"a": 2}]
+
+
+async def test_stream_request_uploads_from_async_iterators(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock, tmp_path
+):
+    report = tmp_path / "report.csv"
+    report.write_bytes(b"a,b\n1,2\n")
+    uploaded: list[bytes] = []
+
+    async def store(request: httpx.Request) -> httpx.Response:
+        uploaded.append(await request.aread())
+        return httpx.Response(201, content=b"stored")
+
+    httpx_mock.add_callback(store, method="POST")
+    client = HttpClient("https://upstream.test")
+
+    response = [
+        chunk
+        async for chunk in client.stream_request(
+            "/reports", RequestMethod.POST, content=aiter_file(report, chunk_size=3)
+        )
+    ]
+
+    assert response == [b"stored"]
+    assert uploaded == [b"a,b\n1,2\n"]
+
+
+async def test_stream_request_raises_status_errors(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(status_code=404, content=b"gone")
+
+    with pytest.raises(NotFoundError):
+        async for _ in HttpClient("https://upstream.test").stream_request("/"):
+            pass
+
+
+async def test_hedges_slow_gets_and_returns_the_first_response(
+    http_pool: HttpClientPool, httpx_mock: HTTPXMock
+):
+    calls = 0
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"attempt": calls})
+
+    httpx_mock.add_callback(respond)
+    client = HttpClient("https://upstream.test", hedge=True)
+    hedging_policies[client.host] = HedgingPolicy(initial_delay=0.01, max_ratio=0.5)
+
+    assert await client.request("/", RequestMethod.GET) == {"attempt": 2}
+    assert await client.request("/", RequestMethod.GET) == {"attempt": 3}
+    assert calls == 3
+    assert (
+        REGISTRY.get_sample_value(
+            "http_hedged_requests_total",
+            {"host": "https://upstream.test", "winner": "hedge"},
+        )
+        == 1
+    )
+
+
+def test_hedging_policy_uses_the_percentile_and_caps_hedges():
+    policy = HedgingPolicy(percentile=0.9, min_samples=10, max_ratio=0.25)
+    for latency in range(1, 11):
+        policy.record_latency(latency / 10)
+        policy.record_request()
+
+    assert policy.delay == 0.9
+    assert [policy.try_hedge() for _ in range(4)] == [True, True, True, False]
+
+
+def test_hedging_policy_recomputes_the_delay_every_few_samples():
+    policy = HedgingPolicy(percentile=0.5, min_samples=2, recompute_every=3)
+    for latency in (0.1, 0.3):
+        policy.record_latency(latency)
+    assert policy.delay == 0.1
+
+    for _ in range(2):
+        policy.record_latency(1.0)
+    assert policy.delay == 0.1
+    policy.record_latency(1.0)
+    assert policy.delay == 1.0
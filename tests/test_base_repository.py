@@ -0,0 +1,349 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from python_api_template.common.enums import TotalMode
+from python_api_template.common.entity_cache import InMemoryEntityCache
+from python_api_template.example.enums.example_status import ExampleStatusEnum
+from python_api_template.example.repository import ExampleRepository
+from python_api_template.internal.db import ExampleModel
+from python_api_template.internal.db.database import DatabaseSessionManager
+
+
+async def test_upsert_many_inserts_and_updates(session: AsyncSession):
+    repository = ExampleRepository(session)
+    existing = await repository.save(
+        ExampleModel(example_name="Existing", example_date=date(2024, 1, 1))
+    )
+    new_id = uuid.uuid4()
+    rows = [
+        {
+            "id": existing.id,
+            "example_name": "Stale",
+            "example_date": date(2024, 1, 2),
+            "example_status": ExampleStatusEnum.A,
+        },
+        {
+            "id": new_id,
+            "example_name": "New",
+            "example_date": date(2024, 1, 3),
+            "example_status": ExampleStatusEnum.B,
+        },
+        {
+            "id": existing.id,
+            "example_name": "Updated",
+            "example_date": date(2024, 1, 2),
+            "example_status": ExampleStatusEnum.B,
+        },
+    ]
+
+    affected_ids = await repository.upsert_many(
+        ExampleModel, rows, conflict_cols=["id"], returning=True, batch_size=1
+    )
+
+    assert sorted(affected_ids) == sorted([existing.id, new_id])
+    session.expunge_all()
+    updated = await repository.find_one(ExampleModel, existing.id)
+    assert updated.example_name == "Updated"
+    assert updated.example_status == ExampleStatusEnum.B
+    created = await repository.find_one(ExampleModel, new_id)
+    assert created.example_name == "New"
+    assert created.example_boolean is True
+
+
+async def test_upsert_many_do_nothing_keeps_existing_rows(session: AsyncSession):
+    repository = ExampleRepository(session)
+    existing = await repository.save(
+        ExampleModel(example_name="Existing", example_date=date(2024, 1, 1))
+    )
+    rows = [
+        {"id": existing.id, "example_name": "Ignored", "example_date": date(2024, 1, 1)}
+    ]
+
+    affected_ids = await repository.upsert_many(
+        ExampleModel, rows, conflict_cols=["id"], update_cols=[], returning=True
+    )
+
+    assert affected_ids == []
+    session.expunge_all()
+    assert (
+        await repository.find_one(ExampleModel, existing.id)
+    ).example_name == "Existing"
+
+
+async def test_copy_insert_applies_defaults_and_reports_rejected_rows(
+    session: AsyncSession,
+):
+    repository = ExampleRepository(session)
+    existing = await repository.save(
+        ExampleModel(example_name="Existing", example_date=date(2024, 1, 1))
+    )
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ids = [uuid.uuid4() for _ in range(4)]
+    rows = [
+        {"id": ids[0], "example_name": "Defaults", "example_date": date(2024, 1, 2)},
+        {
+            "id": existing.id,
+            "example_name": "Duplicate",
+            "example_date": date(2024, 1, 3),
+        },
+        {"id": ids[1], "example_date": date(2024, 1, 4)},
+        {
+            "id": ids[2],
+            "created_at": created_at,
+            "updated_at": created_at,
+            "example_name": "Dated",
+            "example_date": date(2024, 1, 5),
+        },
+        {"id": ids[3], "example_name": "Last", "example_date": date(2024, 1, 6)},
+    ]
+
+    errors = await repository.copy_insert(ExampleModel, rows)
+
+    assert [error is None for error in errors] == [True, False, False, True, True]
+    assert "unique" in errors[1] or "duplicate" in errors[1]
+    assert "example_name" in errors[2]
+    session.expunge_all()
+    defaults = await repository.find_one(ExampleModel, ids[0])
+    assert defaults.example_number == 1
+    assert defaults.example_boolean is True
+    assert defaults.created_at is not None
+    dated = await repository.find_one(ExampleModel, ids[2])
+    assert dated.created_at == created_at
+    assert (await repository.find_one(ExampleModel, ids[3])).example_name == "Last"
+    assert (await repository.find_one(ExampleModel, existing.id)).example_name == (
+        "Existing"
+    )
+
+
+async def test_find_many_preserves_order_and_skips_missing(session: AsyncSession):
+    repository = ExampleRepository(session)
+    first, second = [
+        await repository.save(
+            ExampleModel(example_name=name, example_date=date(2024, 1, 1))
+        )
+        for name in ["First", "Second"]
+    ]
+
+    found = await repository.find_many(
+        ExampleModel, [second.id, uuid.uuid4(), first.id, second.id]
+    )
+
+    assert [example.id for example in found] == [second.id, first.id, second.id]
+
+
+async def test_load_one_coalesces_concurrent_lookups(session: AsyncSession, mocker):
+    repository = ExampleRepository(session)
+    first, second = [
+        await repository.save(
+            ExampleModel(example_name=name, example_date=date(2024, 1, 1))
+        )
+        for name in ["First", "Second"]
+    ]
+    find_many = mocker.spy(repository, "find_many")
+
+    loaded = await asyncio.gather(
+        repository.load_one(ExampleModel, second.id),
+        repository.load_one(ExampleModel, first.id),
+        repository.load_one(ExampleModel, uuid.uuid4()),
+        return_exceptions=True,
+    )
+
+    assert find_many.call_count == 1
+    assert loaded[0].id == second.id
+    assert loaded[1].id == first.id
+    assert isinstance(loaded[2], NoResultFound)
+    with pytest.raises(NoResultFound):
+        await repository.load_one(ExampleModel, uuid.uuid4())
+
+
+async def test_save_without_refresh_issues_a_single_insert(session: AsyncSession):
+    repository = ExampleRepository(session)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        example = await repository.save(
+            ExampleModel(example_name="Saved", example_date=date(2024, 1, 1)),
+            refresh=False,
+        )
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", record)
+
+    assert statements == ["INSERT"]
+    session.expunge_all()
+    stored = await repository.find_one(ExampleModel, example.id)
+    assert stored.created_at == example.created_at
+    assert stored.updated_at == example.updated_at
+    assert stored.example_number == example.example_number
+
+
+async def test_find_one_is_served_from_cache_until_invalidated(session: AsyncSession):
+    repository = ExampleRepository(session, cache=InMemoryEntityCache())
+    example = await repository.save(
+        ExampleModel(example_name="Cached", example_date=date(2024, 1, 1))
+    )
+    session.expunge_all()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        cached = await repository.find_one(ExampleModel, example.id)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", record)
+
+    assert statements == []
+    assert cached in session
+    assert cached.example_name == "Cached"
+    assert cached.created_at == example.created_at
+
+    await repository.update(ExampleModel, example.id, {"example_name": "Updated"})
+    session.expunge_all()
+    assert (await repository.find_one(ExampleModel, example.id)).example_name == (
+        "Updated"
+    )
+
+    await session.commit()
+    await repository.delete(ExampleModel, example.id)
+    session.expunge_all()
+    with pytest.raises(NoResultFound):
+        await repository.find_one(ExampleModel, example.id)
+
+
+async def test_uncommitted_update_is_not_cached(
+    session: AsyncSession, sessionmanager_for_tests: DatabaseSessionManager
+):
+    cache = InMemoryEntityCache()
+    repository = ExampleRepository(session, cache=cache)
+    example = await repository.save(
+        ExampleModel(example_name="Committed", example_date=date(2024, 1, 1))
+    )
+
+    await repository.update(
+        ExampleModel, example.id, {"example_name": "Uncommitted"}, commit=False
+    )
+    session.expunge_all()
+    assert (await repository.find_one(ExampleModel, example.id)).example_name == (
+        "Uncommitted"
+    )
+    assert len(cache) == 0
+
+    # Another request reads, and caches, the committed row meanwhile
+    async with sessionmanager_for_tests.session() as other_session:
+        other = ExampleRepository(other_session, cache=cache)
+        found = await other.find_one(ExampleModel, example.id)
+        assert found.example_name == "Committed"
+    assert len(cache) == 1
+
+    await session.commit()
+    assert len(cache) == 0
+    session.expunge_all()
+    assert (await repository.find_one(ExampleModel, example.id)).example_name == (
+        "Uncommitted"
+    )
+
+
+async def test_rolled_back_update_is_not_cached(session: AsyncSession):
+    cache = InMemoryEntityCache()
+    repository = ExampleRepository(session, cache=cache)
+    example = await repository.save(
+        ExampleModel(example_name="Committed", example_date=date(2024, 1, 1))
+    )
+
+    await repository.update(
+        ExampleModel, example.id, {"example_name": "RolledBack"}, commit=False
+    )
+    session.expunge_all()
+    await repository.find_one(ExampleModel, example.id)
+    await session.rollback()
+
+    assert len(cache) == 0
+    session.expunge_all()
+    assert (await repository.find_one(ExampleModel, example.id)).example_name == (
+        "Committed"
+    )
+    assert len(cache) == 1
+
+
+async def test_instance_without_identity_is_not_cached(session: AsyncSession):
+    cache = InMemoryEntityCache()
+    repository = ExampleRepository(session, cache=cache)
+
+    await repository._cache_put(
+        ExampleModel(example_name="Transient", example_date=date(2024, 1, 1))
+    )
+
+    assert len(cache) == 0
+
+
+async def test_in_memory_entity_cache_refuses_values_read_before_a_delete():
+    cache = InMemoryEntityCache(max_entries=1)
+
+    token = await cache.token("a")
+    await cache.delete("a")
+    await cache.set("a", {"v": "stale"}, token)
+    assert await cache.get("a") is None
+
+    token = await cache.token("a")
+    await cache.set("a", {"v": 1}, token)
+    assert await cache.get("a") == {"v": 1}
+
+    # The delete of "a" is forgotten once "b" is deleted, so tokens taken before
+    # it are refused for every key
+    await cache.delete("a")
+    await cache.delete("b")
+    await cache.set("a", {"v": "stale"}, token)
+    assert await cache.get("a") is None
+    await cache.set("a", {"v": 2}, await cache.token("a"))
+    assert await cache.get("a") == {"v": 2}
+
+
+async def test_in_memory_entity_cache_expires_and_evicts(mocker):
+    monotonic = mocker.patch(
+        "python_api_template.common.entity_cache.time.monotonic", return_value=0
+    )
+    cache = InMemoryEntityCache(ttl=10, max_entries=2)
+
+    await cache.set("a", {"v": 1})
+    await cache.set("b", {"v": 2})
+    assert await cache.get("a") == {"v": 1}
+    await cache.set("c", {"v": 3})
+
+    assert await cache.get("b") is None
+    assert len(cache) == 2
+    monotonic.return_value = 10
+    assert await cache.get("a") is None
+    assert await cache.get("c") is None
+
+
+async def test_count_exact_and_estimated(session: AsyncSession):
+    repository = ExampleRepository(session)
+    for status in [ExampleStatusEnum.A, ExampleStatusEnum.A, ExampleStatusEnum.B]:
+        await repository.save(
+            ExampleModel(
+                example_name="Counted",
+                example_date=date(2024, 1, 1),
+                example_status=status,
+            )
+        )
+    filtered = select(ExampleModel).where(
+        ExampleModel.example_status == ExampleStatusEnum.A
+    )
+
+    assert await repository.count(filtered) == 2
+    # Never analyzed, so the estimate comes from the EXPLAIN plan
+    assert await repository.count(filtered, TotalMode.ESTIMATED) >= 0
+
+    await session.execute(text(f"ANALYZE {ExampleModel.__table__.fullname}"))
+    assert await repository.count(select(ExampleModel), TotalMode.ESTIMATED) == 3